@@ -1,16 +1,27 @@
 class Address(object):
+    __slots__ = ('segment', 'offset', 'linear')
+
     def __init__(self, segment, offset):
         self.segment = segment
         self.offset = offset
+        self.linear = (segment * 16 + offset) & 0xfffff
 
     def __str__(self):
         return '%04X:%04X' % (self.segment, self.offset)
 
+    def __repr__(self):
+        return 'Address(%s)' % self
+
     def __add__(self, other):
         if isinstance(other, int):
-            return Address(self.segment, self.offset + other)
+            return Address(self.segment, (self.offset + other) & 0xffff)
         else:
             raise Exception
 
     def __eq__(self, other):
-        return self.segment == other.segment and self.offset == other.offset
+        if not isinstance(other, Address):
+            return NotImplemented
+        return self.linear == other.linear
+
+    def __hash__(self):
+        return self.linear
@@ -0,0 +1,95 @@
+from bisect import bisect_right
+
+
+class AddressSpace(object):
+    def __init__(self):
+        self.starts = []
+        self.regions = []
+        self.contiguous = None
+
+    def map(self, start, buffer):
+        index = bisect_right(self.starts, start)
+        end = start + len(buffer)
+        if index > 0 and self.regions[index - 1][1] > start or index < len(self.starts) and end > self.starts[index]:
+            raise Exception('Overlapping region', start, end)
+        self.starts.insert(index, start)
+        self.regions.insert(index, (start, end, buffer))
+        self.contiguous = None
+        return start
+
+    def append(self, buffer, alignment=16):
+        end = len(self)
+        return self.map(end + (alignment - end % alignment) % alignment, buffer)
+
+    def region(self, linear):
+        index = bisect_right(self.starts, linear) - 1
+        if index >= 0 and linear < self.regions[index][1]:
+            return index
+        return None
+
+    def __len__(self):
+        return self.regions[-1][1] if self.regions else 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, _ = index.indices(len(self))
+            return bytes(self.__read(start, stop))
+        if index < 0:
+            index += len(self)
+        region = self.region(index)
+        if region is None:
+            if not 0 <= index < len(self):
+                raise IndexError(index)
+            return 0
+        (start, _, buffer) = self.regions[region]
+        return buffer[index - start]
+
+    def __read(self, start, stop):
+        data = bytearray(max(0, stop - start))
+        index = max(0, bisect_right(self.starts, start) - 1)
+        while index < len(self.regions) and self.regions[index][0] < stop:
+            (region_start, region_end, buffer) = self.regions[index]
+            low, high = max(start, region_start), min(stop, region_end)
+            if low < high:
+                data[low - start:high - start] = buffer[low - region_start:high - region_start]
+            index += 1
+        return data
+
+    def write(self, offset, data):
+        if not self.__mapped(offset, offset + len(data)):
+            raise Exception('Unmapped write', offset, offset + len(data))
+        single = self.contiguous is not None and self.contiguous is self.__single()
+        end = offset + len(data)
+        index = max(0, bisect_right(self.starts, offset) - 1)
+        while index < len(self.regions) and self.regions[index][0] < end:
+            (start, region_end, buffer) = self.regions[index]
+            low, high = max(offset, start), min(end, region_end)
+            if low < high:
+                if isinstance(buffer, bytes) or isinstance(buffer, memoryview) and buffer.readonly:
+                    buffer = bytearray(buffer)
+                    self.regions[index] = (start, region_end, buffer)
+                buffer[low - start:high - start] = data[low - offset:high - offset]
+                if self.contiguous is not None and not single:
+                    self.contiguous[low:high] = data[low - offset:high - offset]
+            index += 1
+        if single:
+            self.contiguous = self.__single()
+
+    def __mapped(self, start, stop):
+        index = max(0, bisect_right(self.starts, start) - 1)
+        while start < stop and index < len(self.regions) and self.regions[index][0] <= start:
+            start = max(start, self.regions[index][1])
+            index += 1
+        return start >= stop
+
+    def __single(self):
+        if len(self.regions) == 1 and self.regions[0][0] == 0:
+            return self.regions[0][2]
+        return None
+
+    def view(self):
+        if self.contiguous is None:
+            self.contiguous = self.__single()
+            if self.contiguous is None:
+                self.contiguous = self.__read(0, len(self))
+        return self.contiguous
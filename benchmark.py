@@ -0,0 +1,183 @@
+import argparse
+import io
+import multiprocessing
+import random
+import struct
+import subprocess
+import time
+import tracemalloc
+import types
+
+import instructions
+import loader
+from address import Address
+
+
+CONTROL_FLOW = (0x74, 0x75, 0x9a, 0xc3, 0xcb, 0xe2, 0xe3, 0xe8, 0xeb)
+
+SAMPLES = (
+    b'\x03\xc2', b'\x03\x06\x56\x43', b'\x05\x13\x00', b'\x2b\xc8', b'\x2e\xac', b'\x33\xed', b'\x3b\xda',
+    b'\x80\x7e\xfe\x13', b'\x83\xc7\x04', b'\x89\x1d', b'\x8b\xc4', b'\x8b\x5d\x08', b'\x8c\x06\x84\x43',
+    b'\x8e\xda', b'\x90', b'\x9a\x00\x00\xbb\x15', b'\x26\xa1\x02\x00', b'\xa3\x5c\x43', b'\xb1\x04',
+    b'\xb9\x12\x00', b'\xc4\x7d\x0c', b'\xcd\x21', b'\xd3\xe8', b'\xe2\xf0', b'\xe3\x07', b'\xfc',
+    b'\x50', b'\x5d', b'\x74\x08', b'\x75\xf2', b'\xc3', b'\xcb',
+    b'\xe8\x9f\xf8', b'\xe8\x10\x02', b'\xeb\x05', b'\xeb\xf0', b'\xff\x36\x26\x26', b'\xff\x06\x10\x00',
+)
+
+
+def synthetic_program(count, seed=0):
+    generator = random.Random(seed)
+    program = bytearray()
+    offsets = []
+    for _ in range(count):
+        offsets.append(len(program))
+        program += generator.choice(SAMPLES)
+    return program, offsets
+
+
+def synthetic_traversal(count, seed=0, block=16, segment_instructions=2048):
+    generator = random.Random(seed)
+    straight = [sample for sample in SAMPLES if sample[0] not in CONTROL_FLOW]
+    program = bytearray(0x200)
+    decoded = 0
+    while decoded < count:
+        base = len(program)
+        program += b'\x90\xc3'
+        for _ in range(min(segment_instructions, count - decoded) // block):
+            for _ in range(block - 1):
+                program += generator.choice(straight)
+            offset = len(program) - base
+            program += struct.pack('<Bh', 0xe8, -(offset + 3))
+            decoded += block
+        following = len(program) + 5
+        following += (16 - following % 16) % 16
+        program += struct.pack('<BHH', 0xea, 2, following >> 4)
+        program += bytes(following - len(program))
+        decoded += 3
+    program[-16:-11] = b'\xcb\x00\x00\x00\x00'
+    return program, Address(0x20, 2)
+
+
+def synthetic_procedures(count, seed=0, block=64):
+    generator = random.Random(seed)
+    straight = [sample for sample in SAMPLES if sample[0] not in CONTROL_FLOW]
+    procedures = count // block
+    program = bytearray(0x200)
+    main = len(program)
+    program += bytes(procedures * 5 + 1)
+    program[-1] = 0xcb
+    for procedure in range(procedures):
+        program += bytes((16 - len(program) % 16) % 16)
+        struct.pack_into('<BHH', program, main + procedure * 5, 0x9a, 0, len(program) >> 4)
+        for _ in range(block - 1):
+            program += generator.choice(straight)
+        program += b'\xcb'
+    return program, Address(main >> 4, 0)
+
+
+def load_revision(module, revision):
+    source = subprocess.check_output(['git', 'show', '%s:%s.py' % (revision, module)])
+    namespace = types.ModuleType('%s_%s' % (module, revision))
+    exec(compile(source, '%s@%s' % (module, revision), 'exec'), namespace.__dict__)
+    return namespace
+
+
+def decode_throughput(decode, program, offsets, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for offset in offsets:
+            decode(program, offset)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(offsets) / best
+
+
+def bench_decode(args):
+    program, offsets = synthetic_program(args.instructions)
+    print('decoding %d instructions (%d bytes)' % (len(offsets), len(program)))
+    current = decode_throughput(instructions.Instruction.decode, program, offsets, args.repeat)
+    if args.baseline:
+        baseline = load_revision('instructions', args.baseline)
+        previous = decode_throughput(baseline.Instruction.decode, program, offsets, args.repeat)
+        print('%-10s %12.0f instructions/s' % (args.baseline, previous))
+    print('%-10s %12.0f instructions/s' % ('current', current))
+    if args.baseline:
+        print('speedup    %12.2fx' % (current / previous))
+
+
+def decoded_size(decode, program, offsets):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    decoded = [decode(program, offset) for offset in offsets]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(decoded)
+
+
+def bench_memory(args):
+    program, offsets = synthetic_program(args.instructions)
+    print('keeping %d decoded instructions alive' % len(offsets))
+    if args.baseline:
+        baseline = load_revision('instructions', args.baseline)
+        previous = decoded_size(baseline.Instruction.decode, program, offsets)
+        print('%-10s %8.1f bytes/instruction' % (args.baseline, previous))
+    current = decoded_size(instructions.Instruction.decode, program, offsets)
+    print('%-10s %8.1f bytes/instruction' % ('current', current))
+
+
+def traversal_time(program_class, code, address):
+    program = program_class(io.BytesIO(code), len(code), address)
+    decoded = 0
+    start = time.perf_counter()
+    try:
+        for _ in program:
+            decoded += 1
+    except IndexError:
+        pass
+    return decoded, time.perf_counter() - start
+
+
+def bench_traversal(args):
+    baseline = load_revision('loader', args.baseline) if args.baseline else None
+    for size in (args.instructions // 8, args.instructions // 4, args.instructions // 2, args.instructions):
+        code, address = synthetic_traversal(size)
+        decoded, elapsed = traversal_time(loader.Program, code, address)
+        line = '%8d instructions  current %7.3fs %6.2fus/instruction' % (decoded, elapsed, elapsed * 1e6 / decoded)
+        if baseline:
+            decoded, elapsed = traversal_time(baseline.Program, code, address)
+            line += '  %s %7.3fs %6.2fus/instruction' % (args.baseline, elapsed, elapsed * 1e6 / decoded)
+        print(line)
+
+
+def bench_procedures(args):
+    from callgraph import CallGraph
+    from parallel import ProcedurePool
+    code, address = synthetic_procedures(args.instructions)
+    for jobs in range(1, args.jobs + 1):
+        program = loader.Program(io.BytesIO(code), len(code), address)
+        start = time.perf_counter()
+        if jobs == 1:
+            graph = CallGraph(program).explore([address])
+        else:
+            with ProcedurePool(program, jobs) as pool:
+                graph = CallGraph(program, pool=pool).explore([address])
+        elapsed = time.perf_counter() - start
+        decoded = sum(len(procedure.instructions) for procedure in graph)
+        print('%2d jobs %8d instructions %7.3fs %6.2fus/instruction' % (jobs, decoded, elapsed,
+                                                                       elapsed * 1e6 / decoded))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--baseline', help='git revision to compare against')
+    parser.add_argument('--instructions', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--jobs', type=int, default=multiprocessing.cpu_count())
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('decode').set_defaults(run=bench_decode)
+    commands.add_parser('memory').set_defaults(run=bench_memory)
+    commands.add_parser('traversal').set_defaults(run=bench_traversal)
+    commands.add_parser('procedures').set_defaults(run=bench_procedures)
+    args = parser.parse_args()
+    args.run(args)
@@ -0,0 +1,319 @@
+import heapq
+from array import array
+
+from flow import JUMP, BRANCH, CALL, RETURN, flow_class, branch_target, track_ah, terminates
+from jump_table import JumpTableResolver
+from policy import TraversalPolicy, PROCEDURE_LIMIT
+
+
+ADDRESS_ORDER = 'address'
+BREADTH_FIRST = 'breadth'
+DEPTH_FIRST = 'depth'
+
+
+class Procedure(object):
+    __slots__ = ('entry', 'callers', 'callees', 'call_sites', 'indirect_calls', 'instructions', 'returns',
+                 'undecodable', 'explored', 'truncated', 'stops', 'exits', 'jump_tables', 'parked', 'waiting',
+                 'pending', 'queued')
+
+    def __init__(self, entry):
+        self.entry = entry
+        self.callers = set()
+        self.callees = set()
+        self.call_sites = []
+        self.indirect_calls = []
+        self.instructions = array('I')
+        self.returns = False
+        self.undecodable = set()
+        self.explored = False
+        self.truncated = None
+        self.stops = []
+        self.exits = []
+        self.jump_tables = []
+        self.parked = []
+        self.waiting = []
+        self.pending = [(entry, None)]
+        self.queued = False
+
+    def __str__(self):
+        return 'proc %s' % self.entry
+
+    def task(self):
+        procedure = Procedure(self.entry)
+        procedure.instructions = self.instructions
+        procedure.undecodable = self.undecodable
+        procedure.returns = self.returns
+        procedure.pending = self.pending
+        return procedure
+
+    def reset(self):
+        self.callees = set()
+        self.call_sites = []
+        self.indirect_calls = []
+        self.instructions = array('I')
+        self.returns = False
+        self.undecodable = set()
+        self.stops = []
+        self.exits = []
+        self.jump_tables = []
+        self.pending = [(self.entry, None)]
+
+    def unknown(self):
+        return bool(self.truncated or self.undecodable or self.stops)
+
+    def update(self, explored):
+        self.instructions = explored.instructions
+        self.undecodable = explored.undecodable
+        self.returns = explored.returns
+        self.truncated = explored.truncated
+        self.pending = explored.pending
+        self.callees.update(explored.callees)
+        self.call_sites.extend(explored.call_sites)
+        self.indirect_calls.extend(explored.indirect_calls)
+        self.stops.extend(explored.stops)
+        self.exits.extend(explored.exits)
+        self.jump_tables.extend(explored.jump_tables)
+        self.parked.extend(explored.parked)
+
+
+def explore_procedure(program, procedure, jump_tables, budget, returns):
+    visited = set(procedure.instructions)
+    worklist = procedure.pending
+    procedure.pending = []
+    while worklist:
+        address, ah = worklist.pop()
+        if address.linear in visited or address.linear in procedure.undecodable:
+            continue
+        if budget.is_stop(address):
+            procedure.stops.append(address)
+            continue
+        procedure.truncated = budget.exhausted()
+        if not procedure.truncated and budget.procedure_exhausted(len(visited)):
+            procedure.truncated = PROCEDURE_LIMIT
+        if procedure.truncated:
+            break
+        try:
+            instruction = program.cache.decode(address.linear)
+        except Exception:
+            procedure.undecodable.add(address.linear)
+            continue
+        budget.charge(len(instruction))
+        visited.add(address.linear)
+        flow = flow_class(instruction)
+        target = branch_target(instruction, address)
+        following = address + len(instruction)
+        jump_tables.link(address, following)
+        if flow == CALL:
+            if target is None:
+                procedure.indirect_calls.append(address)
+                worklist.append((following, None))
+            else:
+                target = program.resolve_call(target)
+                procedure.call_sites.append((address, target))
+                procedure.callees.add(target.linear)
+                if returns(target.linear):
+                    worklist.append((following, None))
+                else:
+                    procedure.parked.append((target.linear, following))
+        elif flow == RETURN:
+            procedure.returns = True
+        elif terminates(instruction, ah):
+            procedure.exits.append(address)
+        else:
+            ah = track_ah(instruction, ah)
+            if target is not None and flow in (JUMP, BRANCH):
+                jump_tables.link(address, target)
+                worklist.append((target, ah))
+            elif flow == JUMP:
+                for target in jump_tables.resolve(instruction, address):
+                    jump_tables.link(address, target)
+                    procedure.jump_tables.append((address, target))
+                    worklist.append((target, ah))
+            if flow != JUMP:
+                worklist.append((following, ah))
+    procedure.pending.extend(worklist)
+    procedure.instructions = array('I', sorted(visited))
+    return procedure
+
+
+class CallGraph(object):
+    def __init__(self, program, order=ADDRESS_ORDER, policy=None, pool=None, budget=None):
+        if order not in (ADDRESS_ORDER, BREADTH_FIRST, DEPTH_FIRST):
+            raise Exception('Unknown exploration order', order)
+        self.program = program
+        self.order = order
+        self.budget = budget if budget is not None else (policy or TraversalPolicy()).budget()
+        self.pool = pool
+        self.stopped = None
+        self.procedures = {}
+        self.queue = []
+        self.sequence = 0
+        self.explored = []
+        self.jump_tables = JumpTableResolver(program)
+
+    def explore(self, entries, target=None):
+        for entry in entries:
+            self.__procedure(entry)
+        if self.pool is not None:
+            self.__explore_rounds(self.pool, entries)
+            return self
+        reached = None
+        pending = set()
+        while self.queue:
+            self.stopped = self.budget.exhausted()
+            if self.stopped:
+                break
+            (_, _, procedure) = heapq.heappop(self.queue)
+            procedure.queued = False
+            resumed = self.__explore_procedure(procedure)
+            if target is not None:
+                if procedure.entry == target:
+                    reached = set([target.linear])
+                if reached is not None and procedure.entry.linear in reached:
+                    pending.discard(procedure.entry.linear)
+                    self.__extend_pending(procedure, reached, pending)
+                if reached is not None:
+                    pending.update(caller.entry.linear for caller in resumed if caller.entry.linear in reached)
+                    if not pending:
+                        break
+        return self
+
+    def __explore_rounds(self, pool, entries):
+        while self.queue:
+            self.stopped = self.budget.exhausted()
+            if self.stopped:
+                break
+            batch = []
+            while self.queue:
+                (_, _, procedure) = heapq.heappop(self.queue)
+                procedure.queued = False
+                batch.append(procedure)
+            for procedure, (explored, budget) in zip(batch, pool.explore(batch)):
+                self.budget.merge(budget)
+                procedure.update(explored)
+                procedure.parked = []
+                for (_, target) in explored.call_sites:
+                    self.__procedure(target)
+                if not procedure.explored:
+                    self.explored.append(procedure.entry.linear)
+                procedure.explored = True
+            no_return = set(linear for linear, procedure in self.procedures.items()
+                            if procedure.explored and not procedure.queued and not procedure.returns and
+                            not procedure.unknown() and linear not in pool.flagged)
+            pool.no_return(no_return)
+            for procedure in self.procedures.values():
+                if procedure.explored and not procedure.queued and not no_return.isdisjoint(procedure.callees):
+                    procedure.reset()
+                    self.__queue(procedure)
+        self.__prune(entries)
+
+    def __prune(self, entries):
+        reached = set()
+        for entry in entries:
+            reached.update(self.reachable(entry))
+        self.procedures = dict((linear, procedure) for linear, procedure in self.procedures.items()
+                               if linear in reached)
+        self.explored = [linear for linear in self.explored if linear in reached]
+        for procedure in self.procedures.values():
+            procedure.callers = set()
+        for procedure in self.procedures.values():
+            for callee in procedure.callees:
+                self.procedures[callee].callers.add(procedure.entry.linear)
+
+    def __extend_pending(self, procedure, reached, pending):
+        worklist = list(procedure.callees)
+        while worklist:
+            callee = worklist.pop()
+            if callee not in reached:
+                reached.add(callee)
+                if self.procedures[callee].queued:
+                    pending.add(callee)
+                worklist.extend(self.procedures[callee].callees)
+
+    def __priority(self, entry):
+        self.sequence += 1
+        if self.order == ADDRESS_ORDER:
+            return entry.linear
+        elif self.order == BREADTH_FIRST:
+            return self.sequence
+        return -self.sequence
+
+    def __procedure(self, entry):
+        procedure = self.procedures.get(entry.linear)
+        if procedure is None:
+            procedure = Procedure(entry)
+            self.procedures[entry.linear] = procedure
+            self.__queue(procedure)
+        return procedure
+
+    def __queue(self, procedure):
+        if not procedure.queued:
+            procedure.queued = True
+            heapq.heappush(self.queue, (self.__priority(procedure.entry), self.sequence, procedure))
+
+    def __explore_procedure(self, procedure):
+        returned = self.__resolved(procedure)
+        calls = len(procedure.call_sites)
+        explore_procedure(self.program, procedure, self.jump_tables, self.budget, self.__returns)
+        return self.__merge(procedure, calls, returned)
+
+    def __returns(self, linear):
+        procedure = self.procedures.get(linear)
+        return procedure is not None and self.__resolved(procedure)
+
+    def __resolved(self, procedure):
+        return procedure.returns or procedure.unknown()
+
+    def __merge(self, procedure, calls, returned):
+        for (_, target) in procedure.call_sites[calls:]:
+            self.__procedure(target).callers.add(procedure.entry.linear)
+        for (linear, following) in procedure.parked:
+            callee = self.procedures[linear]
+            if self.__resolved(callee) if callee is not procedure else returned:
+                procedure.pending.append((following, None))
+                self.__queue(procedure)
+            else:
+                callee.waiting.append((procedure, following))
+        procedure.parked = []
+        if not procedure.explored:
+            self.explored.append(procedure.entry.linear)
+        procedure.explored = True
+        resumed = []
+        if self.__resolved(procedure) and not returned:
+            for caller, following in procedure.waiting:
+                caller.pending.append((following, None))
+                self.__queue(caller)
+                resumed.append(caller)
+            procedure.waiting = []
+        return resumed
+
+    def __len__(self):
+        return len(self.procedures)
+
+    def __getitem__(self, address):
+        return self.procedures[address.linear]
+
+    def __iter__(self):
+        return iter(self.procedures.values())
+
+    def no_return(self):
+        unknown = [linear for linear, procedure in self.procedures.items()
+                   if not procedure.explored or procedure.queued or procedure.unknown()]
+        undecided = set(unknown)
+        while unknown:
+            for caller in self.procedures[unknown.pop()].callers:
+                if caller not in undecided and not self.procedures[caller].returns:
+                    undecided.add(caller)
+                    unknown.append(caller)
+        return set(linear for linear, procedure in self.procedures.items()
+                   if procedure.explored and not procedure.returns and linear not in undecided)
+
+    def reachable(self, entry):
+        reached = set()
+        worklist = [entry.linear]
+        while worklist:
+            linear = worklist.pop()
+            if linear not in reached:
+                reached.add(linear)
+                worklist.extend(self.procedures[linear].callees)
+        return reached
@@ -0,0 +1,149 @@
+from array import array
+from bisect import bisect_right
+
+from address import Address
+from flow import FALLTHROUGH, JUMP, BRANCH, CALL, RETURN, flow_class, branch_target
+from jump_table import JumpTableResolver
+
+
+NO_TARGET = 0xffffffff
+
+
+class ControlFlowGraph(object):
+    def __init__(self, program):
+        self.program = program
+        self.block_start = array('I')
+        self.block_end = array('I')
+        self.block_segment = array('H')
+        self.block_flow = array('B')
+        self.block_target = array('I')
+        self.successor_index = array('I', [0])
+        self.successors = array('I')
+        self.predecessor_index = array('I', [0])
+        self.predecessors = array('I')
+        self.calls = []
+        self.jump_tables = {}
+        self.undecodable = set()
+
+    @staticmethod
+    def build(program, entries):
+        graph = ControlFlowGraph(program)
+        instructions, leaders = graph.__discover(entries)
+        graph.__split(instructions, leaders)
+        graph.__link()
+        return graph
+
+    def __discover(self, entries):
+        instructions = {}
+        leaders = set(entry.linear for entry in entries)
+        worklist = list(entries)
+        resolver = JumpTableResolver(self.program)
+        while worklist:
+            address = worklist.pop()
+            if address.linear in instructions or address.linear in self.undecodable:
+                continue
+            try:
+                instruction = self.program.cache.decode(address.linear)
+            except Exception:
+                self.undecodable.add(address.linear)
+                continue
+            length = len(instruction)
+            flow = flow_class(instruction)
+            target = branch_target(instruction, address)
+            if target is not None and flow == CALL:
+                target = self.program.resolve_call(target)
+            instructions[address.linear] = (address.segment, length, flow,
+                                            target.linear if target is not None else NO_TARGET)
+            if target is not None:
+                leaders.add(target.linear)
+                resolver.link(address, target)
+                worklist.append(target)
+                if flow == CALL:
+                    self.calls.append((address.linear, target.linear))
+            elif flow == JUMP:
+                targets = resolver.resolve(instruction, address)
+                if targets:
+                    self.jump_tables[address.linear + length] = [target.linear for target in targets]
+                for target in targets:
+                    leaders.add(target.linear)
+                    resolver.link(address, target)
+                    worklist.append(target)
+            if flow not in (JUMP, RETURN):
+                following = address + length
+                resolver.link(address, following)
+                if flow != FALLTHROUGH:
+                    leaders.add(following.linear)
+                worklist.append(following)
+        return instructions, leaders
+
+    def __split(self, instructions, leaders):
+        end = None
+        for linear in sorted(instructions):
+            segment, length, flow, target = instructions[linear]
+            if end is not None and (linear != end or linear in leaders):
+                self.__close(end, FALLTHROUGH, NO_TARGET)
+                end = None
+            if end is None:
+                self.block_start.append(linear)
+                self.block_segment.append(segment)
+            end = linear + length
+            if flow != FALLTHROUGH:
+                self.__close(end, flow, target)
+                end = None
+        if end is not None:
+            self.__close(end, FALLTHROUGH, NO_TARGET)
+
+    def __close(self, end, flow, target):
+        self.block_end.append(end)
+        self.block_flow.append(flow)
+        self.block_target.append(target)
+
+    def __link(self):
+        blocks = dict((start, index) for index, start in enumerate(self.block_start))
+        predecessors = [[] for _ in self.block_start]
+        for index in range(len(self.block_start)):
+            flow = self.block_flow[index]
+            successors = []
+            if flow != RETURN and flow != JUMP and self.block_end[index] in blocks:
+                successors.append(blocks[self.block_end[index]])
+            if flow in (JUMP, BRANCH) and self.block_target[index] in blocks:
+                target = blocks[self.block_target[index]]
+                if target not in successors:
+                    successors.append(target)
+            for target in self.jump_tables.get(self.block_end[index], ()):
+                if target in blocks and blocks[target] not in successors:
+                    successors.append(blocks[target])
+            for successor in successors:
+                predecessors[successor].append(index)
+            self.successors.extend(successors)
+            self.successor_index.append(len(self.successors))
+        for sources in predecessors:
+            self.predecessors.extend(sources)
+            self.predecessor_index.append(len(self.predecessors))
+
+    def __len__(self):
+        return len(self.block_start)
+
+    def block_of(self, linear):
+        index = bisect_right(self.block_start, linear) - 1
+        if index >= 0 and linear < self.block_end[index]:
+            return index
+        return None
+
+    def successors_of(self, index):
+        return self.successors[self.successor_index[index]:self.successor_index[index + 1]]
+
+    def predecessors_of(self, index):
+        return self.predecessors[self.predecessor_index[index]:self.predecessor_index[index + 1]]
+
+    def address_of(self, index):
+        segment = self.block_segment[index]
+        return Address(segment, self.block_start[index] - segment * 16)
+
+    def instructions(self, index):
+        address = self.address_of(index)
+        while address.linear < self.block_end[index]:
+            instruction = self.program.cache.decode(address.linear)
+            instruction.address = address
+            yield instruction
+            address = address + len(instruction)
@@ -0,0 +1,42 @@
+COVERED = 0x01
+START = 0x02
+
+
+class CoverageMap(object):
+    def __init__(self, size):
+        self.flags = bytearray(size)
+
+    def mark(self, offset, length):
+        end = offset + length
+        if end > len(self.flags):
+            self.flags += bytes(end - len(self.flags))
+        self.flags[offset] |= START | COVERED
+        for covered in range(offset + 1, end):
+            self.flags[covered] |= COVERED
+
+    def is_start(self, offset):
+        return offset < len(self.flags) and self.flags[offset] & START != 0
+
+    def is_covered(self, offset):
+        return offset < len(self.flags) and self.flags[offset] & COVERED != 0
+
+    def overlaps(self, offset, length):
+        return any(self.flags[offset:offset + length])
+
+    def covered_bytes(self, start, end):
+        region = self.flags[start:end]
+        return len(region) - region.count(0)
+
+    def coverage(self, start, end):
+        end = min(end, len(self.flags))
+        if end <= start:
+            return 0.0
+        return self.covered_bytes(start, end) / (end - start)
+
+    def segment_coverage(self, segments):
+        bases = sorted(set(segments))
+        coverage = {}
+        for index, segment in enumerate(bases):
+            end = bases[index + 1] * 16 if index + 1 < len(bases) else len(self.flags)
+            coverage[segment] = self.coverage(segment * 16, end)
+        return coverage
@@ -0,0 +1,56 @@
+from collections import OrderedDict
+
+from address_space import AddressSpace
+from instructions import Instruction
+
+
+class DecodeCache(object):
+    def __init__(self, program, size=65536):
+        self.program = program
+        self.size = size
+        self.instructions = OrderedDict()
+        self.longest = 0
+        self.hits = 0
+        self.misses = 0
+        self.fault = None
+
+    def decode(self, offset):
+        instruction = self.instructions.get(offset)
+        if instruction is not None:
+            self.hits += 1
+            self.instructions.move_to_end(offset)
+            return instruction
+        self.misses += 1
+        if self.fault is not None:
+            self.fault(offset)
+        if isinstance(self.program, AddressSpace):
+            region = self.program.region(offset)
+            if region is None:
+                raise Exception('Unmapped address', offset)
+            (start, _, buffer) = self.program.regions[region]
+            instruction = Instruction.decode(buffer, offset - start)
+        else:
+            instruction = Instruction.decode(self.program, offset)
+        self.instructions[offset] = instruction
+        if len(self.instructions) > self.size:
+            self.instructions.popitem(last=False)
+        self.longest = max(self.longest, len(instruction))
+        return instruction
+
+    def invalidate(self, start, end):
+        first = max(0, start - self.longest + 1)
+        if end - first > len(self.instructions):
+            offsets = [offset for offset in self.instructions if first <= offset < end]
+        else:
+            offsets = range(first, end)
+        for offset in offsets:
+            instruction = self.instructions.get(offset)
+            if instruction is not None and offset + len(instruction) > start:
+                del self.instructions[offset]
+
+    def clear(self):
+        self.instructions.clear()
+        self.longest = 0
+
+    def __len__(self):
+        return len(self.instructions)
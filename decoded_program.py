@@ -0,0 +1,105 @@
+from array import array
+
+from address import Address
+from flow import CALL, branch_target, flow_class
+from instructions import *
+
+
+NO_OPERAND = 0
+REGISTER_OPERAND = 1
+SEGMENT_REGISTER_OPERAND = 2
+IMMEDIATE_OPERAND = 3
+MEMORY_OPERAND = 4
+
+NO_TARGET = -1
+
+OPERAND_KINDS = {
+    Register: REGISTER_OPERAND,
+    SegmentRegister: SEGMENT_REGISTER_OPERAND,
+    Immediate8: IMMEDIATE_OPERAND,
+    Immediate16: IMMEDIATE_OPERAND,
+}
+
+DESTINATION_FIELDS = ('destination', 'dest', 'register', 'modreg', 'immediate8', 'immediate16', 'segment')
+
+
+def operand_kind(operand):
+    if isinstance(operand, ModReg):
+        return REGISTER_OPERAND if operand.template is None else MEMORY_OPERAND
+    return OPERAND_KINDS.get(type(operand), NO_OPERAND)
+
+
+def operand_kinds(instruction):
+    while hasattr(instruction, 'instruction'):
+        instruction = instruction.instruction
+    destination = None
+    for field in DESTINATION_FIELDS:
+        destination = getattr(instruction, field, None)
+        if destination is not None:
+            break
+    return operand_kind(destination), operand_kind(getattr(instruction, 'source', None))
+
+
+class DecodedProgram(object):
+    def __init__(self, program, stubs=None):
+        self.program = program
+        self.stubs = stubs
+        self.linear = array('I')
+        self.segment = array('H')
+        self.offset = array('H')
+        self.length = array('B')
+        self.opcode = array('B')
+        self.mnemonic = array('H')
+        self.destination_kind = array('B')
+        self.source_kind = array('B')
+        self.target = array('i')
+        self.mnemonics = []
+        self.mnemonic_ids = {}
+
+    @staticmethod
+    def collect(program, instructions, stubs=None):
+        decoded = DecodedProgram(program, stubs)
+        for instruction in instructions:
+            decoded.append(instruction)
+        return decoded
+
+    def mnemonic_id(self, mnemonic):
+        if mnemonic not in self.mnemonic_ids:
+            self.mnemonic_ids[mnemonic] = len(self.mnemonics)
+            self.mnemonics.append(mnemonic)
+        return self.mnemonic_ids[mnemonic]
+
+    def append(self, instruction):
+        address = instruction.address
+        linear = address.linear
+        target = branch_target(instruction, address)
+        if target is not None and self.stubs is not None and flow_class(instruction) == CALL:
+            target = self.stubs.resolve(target)
+        destination, source = operand_kinds(instruction)
+        self.linear.append(linear)
+        self.segment.append(address.segment)
+        self.offset.append(address.offset)
+        self.length.append(len(instruction))
+        self.opcode.append(self.program[linear])
+        self.mnemonic.append(self.mnemonic_id(str(instruction).split(' ', 1)[0]))
+        self.destination_kind.append(destination)
+        self.source_kind.append(source)
+        self.target.append(target.linear if target else NO_TARGET)
+
+    def select(self, mnemonic):
+        if mnemonic not in self.mnemonic_ids:
+            return []
+        wanted = self.mnemonic_ids[mnemonic]
+        return [index for index, value in enumerate(self.mnemonic) if value == wanted]
+
+    def __len__(self):
+        return len(self.linear)
+
+    def __getitem__(self, index):
+        instruction = Instruction.decode(self.program, self.linear[index])
+        instruction.address = Address(self.segment[index], self.offset[index])
+        return instruction
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
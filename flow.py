@@ -0,0 +1,85 @@
+from address import Address
+from instructions import *
+
+
+FALLTHROUGH = 0
+JUMP = 1
+BRANCH = 2
+CALL = 3
+RETURN = 4
+
+PREFIXES = (ESSegmentOverride, CSSegmentOverride, SSSegmentOverride, DSSegmentOverride, RepInstruction)
+CONDITIONAL_JUMPS = (JoInstruction, JnoInstruction, JbInstruction, JnbInstruction, JzInstruction, JnzInstruction,
+                     JbeInstruction, JaInstruction, JsInstruction, JnsInstruction, JpeInstruction, JpoInstruction,
+                     JlInstruction, JgeInstruction, JleInstruction, JgInstruction)
+RETURNS = (ReturnImm16Instruction, ReturnInstruction, ReturnIntraInstruction)
+JUMPS = (JumpLongInstruction, JumpNearInstruction, JumpShortInstruction, JumpIndirectInstruction)
+CALLS = (CallInstruction, CallNearInstruction)
+PRESERVES_AH = CONDITIONAL_JUMPS + JUMPS + (
+    NopInstruction, MoveAlInstruction, MoveCLInstruction, MoveDLInstruction, MoveBLInstruction, MoveChInstruction,
+    MoveDhInstruction, MoveBhInstruction, MoveCXInstruction, MoveDXInstruction, MoveBXInstruction, MoveSPInstruction,
+    MoveBPInstruction, MoveSIInstruction, MoveDIInstruction)
+
+DOS_TERMINATE = (0x00, 0x4c)
+
+
+def unwrap(instruction):
+    while isinstance(instruction, PREFIXES):
+        instruction = instruction.instruction
+    return instruction
+
+
+def flow_class(instruction):
+    instruction = unwrap(instruction)
+    if isinstance(instruction, CONDITIONAL_JUMPS + (LoopInstruction, JcxzInstruction)):
+        return BRANCH
+    elif isinstance(instruction, CALLS):
+        return CALL
+    elif isinstance(instruction, RETURNS):
+        return RETURN
+    elif isinstance(instruction, JUMPS):
+        return JUMP
+    return FALLTHROUGH
+
+
+def falls_through(instruction):
+    return flow_class(instruction) not in (JUMP, RETURN)
+
+
+def signed8(immediate8):
+    return immediate8.immediate8 - 0x100 if immediate8.immediate8 > 0x7f else immediate8.immediate8
+
+
+def branch_target(instruction, address):
+    inner = unwrap(instruction)
+    if isinstance(inner, CallInstruction):
+        return Address(inner.segment_address, inner.offset)
+    elif isinstance(inner, Grp2CallNearInstruction):
+        return None
+    elif isinstance(inner, JumpLongInstruction):
+        return Address(inner.segment, inner.offset)
+    elif isinstance(inner, (CallNearInstruction, JumpNearInstruction, JumpShortInstruction)):
+        return address + len(instruction) + inner.offset
+    elif isinstance(inner, CONDITIONAL_JUMPS):
+        return address + len(instruction) + signed8(inner.offset)
+    elif isinstance(inner, (LoopInstruction, JcxzInstruction)):
+        return address + len(instruction) + signed8(inner.immediate8)
+    return None
+
+
+def track_ah(instruction, ah):
+    inner = unwrap(instruction)
+    if isinstance(inner, MoveAhInstruction):
+        return inner.source.immediate8
+    elif isinstance(inner, MoveAXInstruction):
+        return inner.source.immediate16 >> 8
+    elif isinstance(inner, PRESERVES_AH):
+        return ah
+    return None
+
+
+def terminates(instruction, ah):
+    inner = unwrap(instruction)
+    if not isinstance(inner, InterruptInstruction):
+        return False
+    return inner.immediate8.immediate8 == 0x20 or (inner.immediate8.immediate8 == 0x21 and ah in DOS_TERMINATE)
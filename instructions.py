@@ -1,10 +1,24 @@
 import struct
 
 
+class Instruction:
+    __slots__ = ('address', 'segment')
+
+    @staticmethod
+    def decode(program, offset):
+        return DECODERS[program[offset]](program, offset)
+
+
 class Immediate8:
+    __slots__ = ('immediate8',)
+
     def __init__(self, immediate8):
         self.immediate8 = immediate8
 
+    @staticmethod
+    def get(immediate8):
+        return IMMEDIATE8[immediate8 + 128]
+
     def __str__(self):
         if self.immediate8 <= 8:
             return '%d' % self.immediate8
@@ -15,6 +29,8 @@ class Immediate8:
 
 
 class Immediate16:
+    __slots__ = ('immediate16',)
+
     def __init__(self, immediate16):
         self.immediate16 = immediate16
 
@@ -30,12 +46,18 @@ class Immediate16:
 
 
 class Register:
+    __slots__ = ('register', 'word')
+
     def __init__(self, register, word):
         if register > 7:
             raise Exception('Unknown register %d' % register)
         self.register = register
         self.word = word
 
+    @staticmethod
+    def get(register, word):
+        return REGISTERS[register][1 if word else 0]
+
     def __str__(self):
         if self.register == 0:
             return 'ax' if self.word else 'al'
@@ -56,11 +78,19 @@ class Register:
 
 
 class SegmentRegister:
+    __slots__ = ('register',)
+
     def __init__(self, register):
         if register > 3:
             raise Exception('Invalid sr', register)
         self.register = register
 
+    @staticmethod
+    def get(register):
+        if register > 3:
+            raise Exception('Invalid sr', register)
+        return SEGMENT_REGISTERS[register]
+
     def __str__(self):
         if self.register == 0:
             return 'es'
@@ -72,99 +102,74 @@ class SegmentRegister:
             return 'ds'
 
 
+# Operands are immutable and shared between instructions, get() returns the canonical instance
+IMMEDIATE8 = tuple(Immediate8(immediate8) for immediate8 in range(-128, 256))
+REGISTERS = tuple((Register(register, False), Register(register, True)) for register in range(8))
+SEGMENT_REGISTERS = tuple(SegmentRegister(register) for register in range(4))
+
+
+MODRM_BASES = ('bx+si', 'bx+di', 'bp+si', 'bp+di', 'si', 'di', 'bp', 'bx')
+DISPLACEMENT_BASES = ('bx+si', 'bx+di', 'bp+si', 'bp+si', 'si', 'di', 'bp', 'bx')
+
+
+def _modrm_entry(modrm):
+    mod = (modrm & 0xc0) >> 6
+    reg = (modrm & 0x38) >> 3
+    rm = modrm & 0x07
+    if mod == 0 and rm == 6:
+        return mod, reg, rm, 2, 3, '%s', '<H'
+    elif mod == 0:
+        return mod, reg, rm, 0, 1, '[%s]' % MODRM_BASES[rm], None
+    elif mod == 1:
+        return mod, reg, rm, 1, 2, '[%s+%%s]' % DISPLACEMENT_BASES[rm], 'b'
+    elif mod == 2:
+        return mod, reg, rm, 2, 3, '[%s+%%s]' % DISPLACEMENT_BASES[rm], '<h'
+    return mod, reg, rm, 0, 1, None, None
+
+
+# (mod, reg, rm, displacement size, length, template, displacement format) for every ModR/M byte
+MODRM = tuple(_modrm_entry(modrm) for modrm in range(256))
+
+
 class ModReg:
-    def __init__(self, modreg, word, extra=None):
-        self.mod = (modreg & 0xc0) >> 6
-        self.reg = (modreg & 0x38) >> 3
-        self.rm = modreg & 0x07
+    __slots__ = ('mod', 'reg', 'rm', 'length', 'template', 'word', 'displacement')
+
+    def __init__(self, program, offset, word):
+        (self.mod, self.reg, self.rm, size, self.length, self.template, displacement) = MODRM[program[offset]]
         self.word = word
-        self.extra = extra
-
-    def __str__(self):
-        if self.mod == 0:
-            if self.rm == 0:
-                return '[bx+si]'
-            elif self.rm == 1:
-                return '[bx+di]'
-            elif self.rm == 2:
-                return '[bp+si]'
-            elif self.rm == 3:
-                return '[bp+di]'
-            elif self.rm == 4:
-                return '[si]'
-            elif self.rm == 5:
-                return '[di]'
-            elif self.rm == 6:
-                return '%s' % Immediate16(struct.unpack('<H', self.extra[:2])[0])
-            elif self.rm == 7:
-                return '[bx]'
-        elif self.mod == 1:
-            disposition = Immediate8(struct.unpack('b', self.extra[:1])[0])
-            if self.rm == 0:
-                return '[bx+si+%s]' % disposition
-            elif self.rm == 1:
-                return '[bx+di+%s]' % disposition
-            elif self.rm == 2:
-                return '[bp+si+%s]' % disposition
-            elif self.rm == 3:
-                return '[bp+si+%s]' % disposition
-            elif self.rm == 4:
-                return '[si+%s]' % disposition
-            elif self.rm == 5:
-                return '[di+%s]' % disposition
-            elif self.rm == 6:
-                return '[bp+%s]' % disposition
-            elif self.rm == 7:
-                return '[bx+%s]' % disposition
-        elif self.mod == 2:
-            disposition = Immediate16(struct.unpack('<h', self.extra[:2])[0])
-            if self.rm == 0:
-                return '[bx+si+%s]' % disposition
-            elif self.rm == 1:
-                return '[bx+di+%s]' % disposition
-            elif self.rm == 2:
-                return '[bp+si+%s]' % disposition
-            elif self.rm == 3:
-                return '[bp+si+%s]' % disposition
-            elif self.rm == 4:
-                return '[si+%s]' % disposition
-            elif self.rm == 5:
-                return '[di+%s]' % disposition
-            elif self.rm == 6:
-                return '[bp+%s]' % disposition
-            elif self.rm == 7:
-                return '[bx+%s]' % disposition
-        elif self.mod == 3:
-            return '%s' % Register(self.rm, self.word)
+        if size:
+            self.displacement = struct.unpack_from(displacement, program, offset + 1)[0]
+        else:
+            self.displacement = None
+
+    def __str__(self):
+        if self.template is None:
+            return '%s' % Register.get(self.rm, self.word)
+        elif self.displacement is None:
+            return self.template
+        elif self.length == 2:
+            return self.template % Immediate8.get(self.displacement)
+        return self.template % Immediate16(self.displacement)
 
     def __repr__(self):
         return 'ModReg(mod=%d, reg=%d, rm=%d, word=%s)' %\
                (self.mod, self.reg, self.rm, self.word)
 
     def __len__(self):
-        if self.mod == 0:
-            if self.rm == 6:
-                return 3
-            else:
-                return 1
-        elif self.mod == 1:
-            return 2
-        elif self.mod == 2:
-            return 3
-        elif self.mod == 3:
-            return 1
+        return self.length
+
 
+class RegToRegMemBaseInstruction(Instruction):
+    __slots__ = ('opcode', 'direction', 'word', 'modreg', 'destination', 'source')
 
-class RegToRegMemBaseInstruction:
-    def __init__(self, data):
-        self.opcode = data[0]
+    def __init__(self, program, offset):
+        self.opcode = program[offset]
         self.direction = self.get_direction()
         self.word = self.is_word()
-        self.modreg = ModReg(data[1], self.word, data[2:])
-        self.data = data[1 + len(self.modreg):]
+        self.modreg = ModReg(program, offset + 1, self.word)
 
         self.destination = self.get_destination()
-        self.source = self.get_source()
+        self.source = self.get_source(program, offset + 1 + self.modreg.length)
 
     def is_word(self):
         return self.opcode & 0x01 == 0x01
@@ -174,29 +179,33 @@ class RegToRegMemBaseInstruction:
 
     def get_destination(self):
         if self.direction:
-            return Register(self.modreg.reg, self.word)
+            return Register.get(self.modreg.reg, self.word)
         else:
             return self.modreg
 
-    def get_source(self):
+    def get_source(self, program, offset):
         if self.direction:
             return self.modreg
         else:
-            return Register(self.modreg.reg, self.word)
+            return Register.get(self.modreg.reg, self.word)
 
     def __len__(self):
-        return 1 + len(self.modreg)
+        return 1 + self.modreg.length
 
 
 class AddInstruction(RegToRegMemBaseInstruction):
+    __slots__ = ()
+
     def __str__(self):
         return 'add %s, %s' % (self.destination, self.source)
 
 
-class AddAlInstruction:
-    def __init__(self, data):
-        self.source = Immediate8(struct.unpack('B', data)[0])
-        self.destination = Register(0, False)
+class AddAlInstruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate8.get(struct.unpack_from('B', program, offset)[0])
+        self.destination = Register.get(0, False)
 
     def __str__(self):
         return 'add %s, %s' % (self.destination, self.source)
@@ -205,10 +214,12 @@ class AddAlInstruction:
         return 2
 
 
-class AddAxInstruction:
-    def __init__(self, data):
-        self.source = Immediate16(struct.unpack('<H', data)[0])
-        self.destination = Register(0, True)
+class AddAxInstruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate16(struct.unpack_from('<H', program, offset)[0])
+        self.destination = Register.get(0, True)
 
     def __str__(self):
         return 'add %s, %s' % (self.destination, self.source)
@@ -217,9 +228,11 @@ class AddAxInstruction:
         return 3
 
 
-class PushESInstruction:
+class PushESInstruction(Instruction):
+    __slots__ = ()
+
     def __init__(self):
-        self.segment = SegmentRegister(0)
+        self.segment = SegmentRegister.get(0)
 
     def __str__(self):
         return 'push %s' % self.segment
@@ -228,9 +241,11 @@ class PushESInstruction:
         return 1
 
 
-class PopESInstruction:
+class PopESInstruction(Instruction):
+    __slots__ = ()
+
     def __init__(self):
-        self.segment = SegmentRegister(0)
+        self.segment = SegmentRegister.get(0)
 
     def __str__(self):
         return 'pop %s' % self.segment
@@ -240,14 +255,18 @@ class PopESInstruction:
 
 
 class OrInstruction(RegToRegMemBaseInstruction):
+    __slots__ = ()
+
     def __str__(self):
         return 'or %s, %s' % (self.destination, self.source)
 
 
-class OrAlImm8Instruction:
-    def __init__(self, data):
-        self.source = Immediate8(struct.unpack('B', data)[0])
-        self.destination = Register(0, False)
+class OrAlImm8Instruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate8.get(struct.unpack_from('B', program, offset)[0])
+        self.destination = Register.get(0, False)
 
     def __str__(self):
         return 'or %s, %s' % (self.destination, self.source)
@@ -256,10 +275,12 @@ class OrAlImm8Instruction:
         return 2
 
 
-class OrAxImm16Instruction:
-    def __init__(self, data):
-        self.source = Immediate16(struct.unpack('<H', data)[0])
-        self.destination = Register(0, True)
+class OrAxImm16Instruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate16(struct.unpack_from('<H', program, offset)[0])
+        self.destination = Register.get(0, True)
 
     def __str__(self):
         return 'or %s, %s' % (self.destination, self.source)
@@ -268,9 +289,11 @@ class OrAxImm16Instruction:
         return 3
 
 
-class PushCSInstruction:
+class PushCSInstruction(Instruction):
+    __slots__ = ()
+
     def __init__(self):
-        self.segment = SegmentRegister(1)
+        self.segment = SegmentRegister.get(1)
 
     def __str__(self):
         return 'push %s' % self.segment
@@ -280,14 +303,18 @@ class PushCSInstruction:
 
 
 class AdcInstruction(RegToRegMemBaseInstruction):
+    __slots__ = ()
+
     def __str__(self):
         return 'adc %s, %s' % (self.destination, self.source)
 
 
-class AdcAlImm8Instruction:
-    def __init__(self, data):
-        self.source = Immediate8(struct.unpack('B', data)[0])
-        self.destination = Register(0, False)
+class AdcAlImm8Instruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate8.get(struct.unpack_from('B', program, offset)[0])
+        self.destination = Register.get(0, False)
 
     def __str__(self):
         return 'adc %s, %s' % (self.destination, self.source)
@@ -296,10 +323,12 @@ class AdcAlImm8Instruction:
         return 2
 
 
-class AdcAxImm16Instruction:
-    def __init__(self, data):
-        self.source = Immediate16(struct.unpack('<H', data)[0])
-        self.destination = Register(0, True)
+class AdcAxImm16Instruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate16(struct.unpack_from('<H', program, offset)[0])
+        self.destination = Register.get(0, True)
 
     def __str__(self):
         return 'adc %s, %s' % (self.destination, self.source)
@@ -308,9 +337,11 @@ class AdcAxImm16Instruction:
         return 3
 
 
-class PushSSInstruction:
+class PushSSInstruction(Instruction):
+    __slots__ = ()
+
     def __init__(self):
-        self.segment = SegmentRegister(2)
+        self.segment = SegmentRegister.get(2)
 
     def __str__(self):
         return 'push %s' % self.segment
@@ -319,9 +350,11 @@ class PushSSInstruction:
         return 1
 
 
-class PopSSInstruction:
+class PopSSInstruction(Instruction):
+    __slots__ = ()
+
     def __init__(self):
-        self.segment = SegmentRegister(2)
+        self.segment = SegmentRegister.get(2)
 
     def __str__(self):
         return 'pop %s' % self.segment
@@ -331,14 +364,18 @@ class PopSSInstruction:
 
 
 class SBBInstruction(RegToRegMemBaseInstruction):
+    __slots__ = ()
+
     def __str__(self):
         return 'sbb %s, %s' % (self.destination, self.source)
 
 
-class SBBAlImm8Instruction:
-    def __init__(self, data):
-        self.source = Immediate8(struct.unpack('B', data)[0])
-        self.destination = Register(0, False)
+class SBBAlImm8Instruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate8.get(struct.unpack_from('B', program, offset)[0])
+        self.destination = Register.get(0, False)
 
     def __str__(self):
         return 'sbb %s, %s' % (self.destination, self.source)
@@ -347,10 +384,12 @@ class SBBAlImm8Instruction:
         return 2
 
 
-class SBBAxImm16Instruction:
-    def __init__(self, data):
-        self.source = Immediate16(struct.unpack('<H', data)[0])
-        self.destination = Register(0, True)
+class SBBAxImm16Instruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate16(struct.unpack_from('<H', program, offset)[0])
+        self.destination = Register.get(0, True)
 
     def __str__(self):
         return 'sbb %s, %s' % (self.destination, self.source)
@@ -359,9 +398,11 @@ class SBBAxImm16Instruction:
         return 3
 
 
-class PushDSInstruction:
+class PushDSInstruction(Instruction):
+    __slots__ = ()
+
     def __init__(self):
-        self.segment = SegmentRegister(3)
+        self.segment = SegmentRegister.get(3)
 
     def __str__(self):
         return 'push %s' % self.segment
@@ -370,9 +411,11 @@ class PushDSInstruction:
         return 1
 
 
-class PopDSInstruction:
+class PopDSInstruction(Instruction):
+    __slots__ = ()
+
     def __init__(self):
-        self.segment = SegmentRegister(3)
+        self.segment = SegmentRegister.get(3)
 
     def __str__(self):
         return 'pop %s' % self.segment
@@ -382,14 +425,18 @@ class PopDSInstruction:
 
 
 class AndInstruction(RegToRegMemBaseInstruction):
+    __slots__ = ()
+
     def __str__(self):
         return 'and %s, %s' % (self.destination, self.source)
 
 
-class AndALImm8Instruction:
-    def __init__(self, data):
-        self.source = Immediate8(struct.unpack('B', data)[0])
-        self.destination = Register(0, False)
+class AndALImm8Instruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate8.get(struct.unpack_from('B', program, offset)[0])
+        self.destination = Register.get(0, False)
 
     def __str__(self):
         return 'and %s, %s' % (self.destination, self.source)
@@ -398,10 +445,12 @@ class AndALImm8Instruction:
         return 2
 
 
-class AndAXImm16Instruction:
-    def __init__(self, data):
-        self.source = Immediate16(struct.unpack('<H', data)[0])
-        self.destination = Register(0, True)
+class AndAXImm16Instruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate16(struct.unpack_from('<H', program, offset)[0])
+        self.destination = Register.get(0, True)
 
     def __str__(self):
         return 'and %s, %s' % (self.destination, self.source)
@@ -410,7 +459,9 @@ class AndAXImm16Instruction:
         return 3
 
 
-class ESSegmentOverride:
+class ESSegmentOverride(Instruction):
+    __slots__ = ('instruction',)
+
     def __init__(self, instruction):
         self.instruction = instruction
         self.instruction.segment = 'es'
@@ -422,7 +473,9 @@ class ESSegmentOverride:
         return len(self.instruction) + 1
 
 
-class DAAInstruction:
+class DAAInstruction(Instruction):
+    __slots__ = ()
+
     def __str__(self):
         return 'daa'
 
@@ -431,14 +484,18 @@ class DAAInstruction:
 
 
 class SubInstruction(RegToRegMemBaseInstruction):
+    __slots__ = ()
+
     def __str__(self):
         return 'sub %s, %s' % (self.destination, self.source)
 
 
-class SubAlImm8Instruction:
-    def __init__(self, data):
-        self.source = Immediate8(struct.unpack('B', data)[0])
-        self.destination = Register(0, False)
+class SubAlImm8Instruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate8.get(struct.unpack_from('B', program, offset)[0])
+        self.destination = Register.get(0, False)
 
     def __str__(self):
         return 'sub %s, %s' % (self.destination, self.source)
@@ -447,10 +504,12 @@ class SubAlImm8Instruction:
         return 2
 
 
-class SubAxImm16Instruction:
-    def __init__(self, data):
-        self.source = Immediate16(struct.unpack('<H', data)[0])
-        self.destination = Register(0, True)
+class SubAxImm16Instruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate16(struct.unpack_from('<H', program, offset)[0])
+        self.destination = Register.get(0, True)
 
     def __str__(self):
         return 'sub %s, %s' % (self.destination, self.source)
@@ -459,7 +518,9 @@ class SubAxImm16Instruction:
         return 3
 
 
-class CSSegmentOverride:
+class CSSegmentOverride(Instruction):
+    __slots__ = ('instruction',)
+
     def __init__(self, instruction):
         self.instruction = instruction
         self.instruction.segment = 'cs'
@@ -472,11 +533,15 @@ class CSSegmentOverride:
 
 
 class XorInstruction(RegToRegMemBaseInstruction):
+    __slots__ = ()
+
     def __str__(self):
         return 'xor %s, %s' % (self.destination, self.source)
 
 
-class SSSegmentOverride:
+class SSSegmentOverride(Instruction):
+    __slots__ = ('instruction',)
+
     def __init__(self, instruction):
         self.instruction = instruction
         self.instruction.segment = 'ss'
@@ -489,14 +554,18 @@ class SSSegmentOverride:
 
 
 class CmpInstruction(RegToRegMemBaseInstruction):
+    __slots__ = ()
+
     def __str__(self):
         return 'cmp %s, %s' % (self.destination, self.source)
 
 
-class CmpAlImm8Instruction:
-    def __init__(self, data):
-        self.source = Immediate8(struct.unpack('B', data)[0])
-        self.destination = Register(0, False)
+class CmpAlImm8Instruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate8.get(struct.unpack_from('B', program, offset)[0])
+        self.destination = Register.get(0, False)
 
     def __str__(self):
         return 'cmp %s, %s' % (self.destination, self.source)
@@ -505,10 +574,12 @@ class CmpAlImm8Instruction:
         return 2
 
 
-class CmpAxImm16Instruction:
-    def __init__(self, data):
-        self.source = Immediate16(struct.unpack('<H', data)[0])
-        self.destination = Register(0, True)
+class CmpAxImm16Instruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate16(struct.unpack_from('<H', program, offset)[0])
+        self.destination = Register.get(0, True)
 
     def __str__(self):
         return 'cmp %s, %s' % (self.destination, self.source)
@@ -517,7 +588,9 @@ class CmpAxImm16Instruction:
         return 3
 
 
-class DSSegmentOverride:
+class DSSegmentOverride(Instruction):
+    __slots__ = ('instruction',)
+
     def __init__(self, instruction):
         self.instruction = instruction
         self.instruction.segment = 'ds'
@@ -529,9 +602,11 @@ class DSSegmentOverride:
         return len(self.instruction) + 1
 
 
-class IncAXInstruction:
+class IncAXInstruction(Instruction):
+    __slots__ = ('register',)
+
     def __init__(self):
-        self.register = Register(0, True)
+        self.register = Register.get(0, True)
 
     def __str__(self):
         return 'inc %s' % self.register
@@ -540,9 +615,11 @@ class IncAXInstruction:
         return 1
 
 
-class IncCXInstruction:
+class IncCXInstruction(Instruction):
+    __slots__ = ('register',)
+
     def __init__(self):
-        self.register = Register(1, True)
+        self.register = Register.get(1, True)
 
     def __str__(self):
         return 'inc %s' % self.register
@@ -551,9 +628,11 @@ class IncCXInstruction:
         return 1
 
 
-class IncDXInstruction:
+class IncDXInstruction(Instruction):
+    __slots__ = ('register',)
+
     def __init__(self):
-        self.register = Register(2, True)
+        self.register = Register.get(2, True)
 
     def __str__(self):
         return 'inc %s' % self.register
@@ -562,9 +641,11 @@ class IncDXInstruction:
         return 1
 
 
-class IncBXInstruction:
+class IncBXInstruction(Instruction):
+    __slots__ = ('register',)
+
     def __init__(self):
-        self.register = Register(3, True)
+        self.register = Register.get(3, True)
 
     def __str__(self):
         return 'inc %s' % self.register
@@ -573,9 +654,11 @@ class IncBXInstruction:
         return 1
 
 
-class IncSPInstruction:
+class IncSPInstruction(Instruction):
+    __slots__ = ('register',)
+
     def __init__(self):
-        self.register = Register(4, True)
+        self.register = Register.get(4, True)
 
     def __str__(self):
         return 'inc %s' % self.register
@@ -584,9 +667,11 @@ class IncSPInstruction:
         return 1
 
 
-class IncBPInstruction:
+class IncBPInstruction(Instruction):
+    __slots__ = ('register',)
+
     def __init__(self):
-        self.register = Register(5, True)
+        self.register = Register.get(5, True)
 
     def __str__(self):
         return 'inc %s' % self.register
@@ -595,9 +680,11 @@ class IncBPInstruction:
         return 1
 
 
-class IncSIInstruction:
+class IncSIInstruction(Instruction):
+    __slots__ = ('register',)
+
     def __init__(self):
-        self.register = Register(6, True)
+        self.register = Register.get(6, True)
 
     def __str__(self):
         return 'inc %s' % self.register
@@ -606,9 +693,11 @@ class IncSIInstruction:
         return 1
 
 
-class IncDIInstruction:
+class IncDIInstruction(Instruction):
+    __slots__ = ('register',)
+
     def __init__(self):
-        self.register = Register(7, True)
+        self.register = Register.get(7, True)
 
     def __str__(self):
         return 'inc %s' % self.register
@@ -617,9 +706,11 @@ class IncDIInstruction:
         return 1
 
 
-class DecAXInstruction:
+class DecAXInstruction(Instruction):
+    __slots__ = ('register',)
+
     def __init__(self):
-        self.register = Register(0, True)
+        self.register = Register.get(0, True)
 
     def __str__(self):
         return 'dec %s' % self.register
@@ -628,9 +719,11 @@ class DecAXInstruction:
         return 1
 
 
-class DecCXInstruction:
+class DecCXInstruction(Instruction):
+    __slots__ = ('register',)
+
     def __init__(self):
-        self.register = Register(1, True)
+        self.register = Register.get(1, True)
 
     def __str__(self):
         return 'dec %s' % self.register
@@ -639,9 +732,11 @@ class DecCXInstruction:
         return 1
 
 
-class DecDXInstruction:
+class DecDXInstruction(Instruction):
+    __slots__ = ('register',)
+
     def __init__(self):
-        self.register = Register(2, True)
+        self.register = Register.get(2, True)
 
     def __str__(self):
         return 'dec %s' % self.register
@@ -650,9 +745,11 @@ class DecDXInstruction:
         return 1
 
 
-class DecBXInstruction:
+class DecBXInstruction(Instruction):
+    __slots__ = ('register',)
+
     def __init__(self):
-        self.register = Register(3, True)
+        self.register = Register.get(3, True)
 
     def __str__(self):
         return 'dec %s' % self.register
@@ -661,9 +758,11 @@ class DecBXInstruction:
         return 1
 
 
-class DecSPInstruction:
+class DecSPInstruction(Instruction):
+    __slots__ = ('register',)
+
     def __init__(self):
-        self.register = Register(4, True)
+        self.register = Register.get(4, True)
 
     def __str__(self):
         return 'dec %s' % self.register
@@ -672,9 +771,11 @@ class DecSPInstruction:
         return 1
 
 
-class DecBPInstruction:
+class DecBPInstruction(Instruction):
+    __slots__ = ('register',)
+
     def __init__(self):
-        self.register = Register(5, True)
+        self.register = Register.get(5, True)
 
     def __str__(self):
         return 'dec %s' % self.register
@@ -683,9 +784,11 @@ class DecBPInstruction:
         return 1
 
 
-class DecSIInstruction:
+class DecSIInstruction(Instruction):
+    __slots__ = ('register',)
+
     def __init__(self):
-        self.register = Register(6, True)
+        self.register = Register.get(6, True)
 
     def __str__(self):
         return 'dec %s' % self.register
@@ -694,9 +797,11 @@ class DecSIInstruction:
         return 1
 
 
-class DecDIInstruction:
+class DecDIInstruction(Instruction):
+    __slots__ = ('register',)
+
     def __init__(self):
-        self.register = Register(7, True)
+        self.register = Register.get(7, True)
 
     def __str__(self):
         return 'dec %s' % self.register
@@ -705,9 +810,11 @@ class DecDIInstruction:
         return 1
 
 
-class PushInstruction:
+class PushInstruction(Instruction):
+    __slots__ = ('register',)
+
     def __init__(self, register):
-        self.register = Register(register, word=True)
+        self.register = Register.get(register, word=True)
 
     def __str__(self):
         return 'push %s' % self.register
@@ -716,9 +823,11 @@ class PushInstruction:
         return 1
 
 
-class PopInstruction:
+class PopInstruction(Instruction):
+    __slots__ = ('register',)
+
     def __init__(self, register):
-        self.register = Register(register, word=True)
+        self.register = Register.get(register, word=True)
 
     def __str__(self):
         return 'pop %s' % self.register
@@ -727,9 +836,11 @@ class PopInstruction:
         return 1
 
 
-class JoInstruction:
-    def __init__(self, data):
-        self.offset = Immediate8(struct.unpack('B', data)[0])
+class JoInstruction(Instruction):
+    __slots__ = ('offset',)
+
+    def __init__(self, program, offset):
+        self.offset = Immediate8.get(struct.unpack_from('B', program, offset)[0])
 
     def __str__(self):
         return 'jo %s' % self.offset
@@ -738,9 +849,11 @@ class JoInstruction:
         return 2
 
 
-class JnoInstruction:
-    def __init__(self, data):
-        self.offset = Immediate8(struct.unpack('B', data)[0])
+class JnoInstruction(Instruction):
+    __slots__ = ('offset',)
+
+    def __init__(self, program, offset):
+        self.offset = Immediate8.get(struct.unpack_from('B', program, offset)[0])
 
     def __str__(self):
         return 'jno %s' % self.offset
@@ -749,9 +862,11 @@ class JnoInstruction:
         return 2
 
 
-class JbInstruction:
-    def __init__(self, data):
-        self.offset = Immediate8(struct.unpack('B', data)[0])
+class JbInstruction(Instruction):
+    __slots__ = ('offset',)
+
+    def __init__(self, program, offset):
+        self.offset = Immediate8.get(struct.unpack_from('B', program, offset)[0])
 
     def __str__(self):
         return 'jb %s' % self.offset
@@ -760,9 +875,11 @@ class JbInstruction:
         return 2
 
 
-class JnbInstruction:
-    def __init__(self, data):
-        self.offset = Immediate8(struct.unpack('B', data)[0])
+class JnbInstruction(Instruction):
+    __slots__ = ('offset',)
+
+    def __init__(self, program, offset):
+        self.offset = Immediate8.get(struct.unpack_from('B', program, offset)[0])
 
     def __str__(self):
         return 'jnb %s' % self.offset
@@ -771,9 +888,11 @@ class JnbInstruction:
         return 2
 
 
-class JzInstruction:
-    def __init__(self, data):
-        self.offset = Immediate8(struct.unpack('B', data)[0])
+class JzInstruction(Instruction):
+    __slots__ = ('offset',)
+
+    def __init__(self, program, offset):
+        self.offset = Immediate8.get(struct.unpack_from('B', program, offset)[0])
 
     def __str__(self):
         return 'jz %s' % self.offset
@@ -782,9 +901,11 @@ class JzInstruction:
         return 2
 
 
-class JnzInstruction:
-    def __init__(self, data):
-        self.offset = Immediate8(struct.unpack('B', data)[0])
+class JnzInstruction(Instruction):
+    __slots__ = ('offset',)
+
+    def __init__(self, program, offset):
+        self.offset = Immediate8.get(struct.unpack_from('B', program, offset)[0])
 
     def __str__(self):
         return 'jnz %s' % self.offset
@@ -793,9 +914,11 @@ class JnzInstruction:
         return 2
 
 
-class JbeInstruction:
-    def __init__(self, data):
-        self.offset = Immediate8(struct.unpack('B', data)[0])
+class JbeInstruction(Instruction):
+    __slots__ = ('offset',)
+
+    def __init__(self, program, offset):
+        self.offset = Immediate8.get(struct.unpack_from('B', program, offset)[0])
 
     def __str__(self):
         return 'jbe %s' % self.offset
@@ -804,9 +927,11 @@ class JbeInstruction:
         return 2
 
 
-class JaInstruction:
-    def __init__(self, data):
-        self.offset = Immediate8(struct.unpack('B', data)[0])
+class JaInstruction(Instruction):
+    __slots__ = ('offset',)
+
+    def __init__(self, program, offset):
+        self.offset = Immediate8.get(struct.unpack_from('B', program, offset)[0])
 
     def __str__(self):
         return 'ja %s' % self.offset
@@ -815,9 +940,11 @@ class JaInstruction:
         return 2
 
 
-class JsInstruction:
-    def __init__(self, data):
-        self.offset = Immediate8(struct.unpack('B', data)[0])
+class JsInstruction(Instruction):
+    __slots__ = ('offset',)
+
+    def __init__(self, program, offset):
+        self.offset = Immediate8.get(struct.unpack_from('B', program, offset)[0])
 
     def __str__(self):
         return 'js %s' % self.offset
@@ -826,9 +953,11 @@ class JsInstruction:
         return 2
 
 
-class JnsInstruction:
-    def __init__(self, data):
-        self.offset = Immediate8(struct.unpack('B', data)[0])
+class JnsInstruction(Instruction):
+    __slots__ = ('offset',)
+
+    def __init__(self, program, offset):
+        self.offset = Immediate8.get(struct.unpack_from('B', program, offset)[0])
 
     def __str__(self):
         return 'jns %s' % self.offset
@@ -837,9 +966,11 @@ class JnsInstruction:
         return 2
 
 
-class JpeInstruction:
-    def __init__(self, data):
-        self.offset = Immediate8(struct.unpack('B', data)[0])
+class JpeInstruction(Instruction):
+    __slots__ = ('offset',)
+
+    def __init__(self, program, offset):
+        self.offset = Immediate8.get(struct.unpack_from('B', program, offset)[0])
 
     def __str__(self):
         return 'jpe %s' % self.offset
@@ -848,9 +979,11 @@ class JpeInstruction:
         return 2
 
 
-class JpoInstruction:
-    def __init__(self, data):
-        self.offset = Immediate8(struct.unpack('B', data)[0])
+class JpoInstruction(Instruction):
+    __slots__ = ('offset',)
+
+    def __init__(self, program, offset):
+        self.offset = Immediate8.get(struct.unpack_from('B', program, offset)[0])
 
     def __str__(self):
         return 'jpo %s' % self.offset
@@ -859,9 +992,11 @@ class JpoInstruction:
         return 2
 
 
-class JlInstruction:
-    def __init__(self, data):
-        self.offset = Immediate8(struct.unpack('B', data)[0])
+class JlInstruction(Instruction):
+    __slots__ = ('offset',)
+
+    def __init__(self, program, offset):
+        self.offset = Immediate8.get(struct.unpack_from('B', program, offset)[0])
 
     def __str__(self):
         return 'jl %s' % self.offset
@@ -870,9 +1005,11 @@ class JlInstruction:
         return 2
 
 
-class JgeInstruction:
-    def __init__(self, data):
-        self.offset = Immediate8(struct.unpack('B', data)[0])
+class JgeInstruction(Instruction):
+    __slots__ = ('offset',)
+
+    def __init__(self, program, offset):
+        self.offset = Immediate8.get(struct.unpack_from('B', program, offset)[0])
 
     def __str__(self):
         return 'jge %s' % self.offset
@@ -881,9 +1018,11 @@ class JgeInstruction:
         return 2
 
 
-class JleInstruction:
-    def __init__(self, data):
-        self.offset = Immediate8(struct.unpack('B', data)[0])
+class JleInstruction(Instruction):
+    __slots__ = ('offset',)
+
+    def __init__(self, program, offset):
+        self.offset = Immediate8.get(struct.unpack_from('B', program, offset)[0])
 
     def __str__(self):
         return 'jle %s' % self.offset
@@ -892,9 +1031,11 @@ class JleInstruction:
         return 2
 
 
-class JgInstruction:
-    def __init__(self, data):
-        self.offset = Immediate8(struct.unpack('B', data)[0])
+class JgInstruction(Instruction):
+    __slots__ = ('offset',)
+
+    def __init__(self, program, offset):
+        self.offset = Immediate8.get(struct.unpack_from('B', program, offset)[0])
 
     def __str__(self):
         return 'jg %s' % self.offset
@@ -903,53 +1044,47 @@ class JgInstruction:
         return 2
 
 
-class IntermediateInstruction:
-    def __init__(self, data):
-        opcode = data[0] & 0x3
-        self.modreg = ModReg(data[1], data[0] & 0x1, data[2:])
+INTERMEDIATE_MNEMONICS = ('add', 'or', 'adc', 'sbb', 'and', 'sub', 'xor', 'cmp')
+
+
+class IntermediateInstruction(Instruction):
+    __slots__ = ('modreg', 'destination', 'src_word', 'source')
+
+    def __init__(self, program, offset):
+        opcode = program[offset] & 0x3
+        self.modreg = ModReg(program, offset + 1, program[offset] & 0x1)
         self.destination = self.modreg
-        self.data = data[1 + len(self.modreg):]
+        offset += 1 + self.modreg.length
         if opcode == 0:
             self.src_word = False
-            self.source = Immediate8(struct.unpack('B', self.data[:1])[0])
+            self.source = Immediate8.get(struct.unpack_from('B', program, offset)[0])
         elif opcode == 1:
             self.src_word = True
-            self.source = Immediate16(struct.unpack('<H', self.data[:2])[0])
+            self.source = Immediate16(struct.unpack_from('<H', program, offset)[0])
         elif opcode == 2:
             self.src_word = False
-            self.source = Immediate8(struct.unpack('B', self.data[:1])[0])
+            self.source = Immediate8.get(struct.unpack_from('B', program, offset)[0])
         elif opcode == 3:
             self.src_word = False
-            self.source = Immediate8(struct.unpack('B', self.data[:1])[0])
+            self.source = Immediate8.get(struct.unpack_from('B', program, offset)[0])
 
     def __str__(self):
-        if self.modreg.reg == 0:
-            return 'add %s, %s' % (self.destination, self.source)
-        elif self.modreg.reg == 1:
-            return 'or %s, %s' % (self.destination, self.source)
-        elif self.modreg.reg == 2:
-            return 'adc %s, %s' % (self.destination, self.source)
-        elif self.modreg.reg == 3:
-            return 'sbb %s, %s' % (self.destination, self.source)
-        elif self.modreg.reg == 4:
-            return 'and %s, %s' % (self.destination, self.source)
-        elif self.modreg.reg == 5:
-            return 'sub %s, %s' % (self.destination, self.source)
-        elif self.modreg.reg == 6:
-            return 'xor %s, %s' % (self.destination, self.source)
-        elif self.modreg.reg == 7:
-            return 'cmp %s, %s' % (self.destination, self.source)
+        return '%s %s, %s' % (INTERMEDIATE_MNEMONICS[self.modreg.reg], self.destination, self.source)
 
     def __len__(self):
-        return 1 + len(self.destination) + len(self.source)
+        return 1 + self.modreg.length + len(self.source)
 
 
 class TestInstruction(RegToRegMemBaseInstruction):
+    __slots__ = ()
+
     def __str__(self):
         return 'test %s, %s' % (self.destination, self.source)
 
 
 class XchgInstruction(RegToRegMemBaseInstruction):
+    __slots__ = ()
+
     def is_word(self):
         return False
 
@@ -958,35 +1093,43 @@ class XchgInstruction(RegToRegMemBaseInstruction):
 
 
 class MovInstruction(RegToRegMemBaseInstruction):
+    __slots__ = ()
+
     def __str__(self):
         return 'mov %s, %s' % (self.destination, self.source)
 
 
 class MoveSegRegInstruction(RegToRegMemBaseInstruction):
+    __slots__ = ()
+
     def is_word(self):
         return True
 
     def get_destination(self):
         if self.direction:
-            return SegmentRegister(self.modreg.reg)
+            return SegmentRegister.get(self.modreg.reg)
         else:
             return self.modreg
 
-    def get_source(self):
+    def get_source(self, program, offset):
         if self.direction:
             return self.modreg
         else:
-            return SegmentRegister(self.modreg.reg)
+            return SegmentRegister.get(self.modreg.reg)
 
     def __str__(self):
         return 'mov %s, %s' % (self.destination, self.source)
 
 class LoadEffectiveAddressInstruction(RegToRegMemBaseInstruction):
+    __slots__ = ()
+
     def __str__(self):
         return 'lea %s, %s' % (self.destination, self.source)
 
 
-class NopInstruction:
+class NopInstruction(Instruction):
+    __slots__ = ()
+
     def __init__(self):
         pass
 
@@ -997,10 +1140,12 @@ class NopInstruction:
         return 1
 
 
-class XchgAxCxInstruction:
+class XchgAxCxInstruction(Instruction):
+    __slots__ = ('dest', 'source')
+
     def __init__(self):
-        self.dest = Register(0, True)
-        self.source = Register(1, True)
+        self.dest = Register.get(0, True)
+        self.source = Register.get(1, True)
 
     def __str__(self):
         return 'xchg %s, %s' % (self.dest, self.source)
@@ -1009,10 +1154,12 @@ class XchgAxCxInstruction:
         return 1
 
 
-class XchgAxDxInstruction:
+class XchgAxDxInstruction(Instruction):
+    __slots__ = ('dest', 'source')
+
     def __init__(self):
-        self.dest = Register(0, True)
-        self.source = Register(2, True)
+        self.dest = Register.get(0, True)
+        self.source = Register.get(2, True)
 
     def __str__(self):
         return 'xchg %s, %s' % (self.dest, self.source)
@@ -1021,10 +1168,12 @@ class XchgAxDxInstruction:
         return 1
 
 
-class XchgAxBxInstruction:
+class XchgAxBxInstruction(Instruction):
+    __slots__ = ('dest', 'source')
+
     def __init__(self):
-        self.dest = Register(0, True)
-        self.source = Register(3, True)
+        self.dest = Register.get(0, True)
+        self.source = Register.get(3, True)
 
     def __str__(self):
         return 'xchg %s, %s' % (self.dest, self.source)
@@ -1033,10 +1182,12 @@ class XchgAxBxInstruction:
         return 1
 
 
-class XchgAxSpInstruction:
+class XchgAxSpInstruction(Instruction):
+    __slots__ = ('dest', 'source')
+
     def __init__(self):
-        self.dest = Register(0, True)
-        self.source = Register(4, True)
+        self.dest = Register.get(0, True)
+        self.source = Register.get(4, True)
 
     def __str__(self):
         return 'xchg %s, %s' % (self.dest, self.source)
@@ -1046,10 +1197,12 @@ class XchgAxSpInstruction:
         return 1
 
 
-class XchgAxBpInstruction:
+class XchgAxBpInstruction(Instruction):
+    __slots__ = ('dest', 'source')
+
     def __init__(self):
-        self.dest = Register(0, True)
-        self.source = Register(5, True)
+        self.dest = Register.get(0, True)
+        self.source = Register.get(5, True)
 
     def __str__(self):
         return 'xchg %s, %s' % (self.dest, self.source)
@@ -1059,10 +1212,12 @@ class XchgAxBpInstruction:
         return 1
 
 
-class XchgAxSiInstruction:
+class XchgAxSiInstruction(Instruction):
+    __slots__ = ('dest', 'source')
+
     def __init__(self):
-        self.dest = Register(0, True)
-        self.source = Register(6, True)
+        self.dest = Register.get(0, True)
+        self.source = Register.get(6, True)
 
     def __str__(self):
         return 'xchg %s, %s' % (self.dest, self.source)
@@ -1072,10 +1227,12 @@ class XchgAxSiInstruction:
         return 1
 
 
-class XchgAxDiInstruction:
+class XchgAxDiInstruction(Instruction):
+    __slots__ = ('dest', 'source')
+
     def __init__(self):
-        self.dest = Register(0, True)
-        self.source = Register(7, True)
+        self.dest = Register.get(0, True)
+        self.source = Register.get(7, True)
 
     def __str__(self):
         return 'xchg %s, %s' % (self.dest, self.source)
@@ -1085,7 +1242,9 @@ class XchgAxDiInstruction:
         return 1
 
 
-class CbwInstruction:
+class CbwInstruction(Instruction):
+    __slots__ = ()
+
     def __init__(self):
         pass
 
@@ -1096,7 +1255,9 @@ class CbwInstruction:
         return 1
 
 
-class CwdInstruction:
+class CwdInstruction(Instruction):
+    __slots__ = ()
+
     def __init__(self):
         pass
 
@@ -1107,10 +1268,11 @@ class CwdInstruction:
         return 1
 
 
-class CallInstruction:
-    def __init__(self, data):
-        self.data = data
-        self.offset, self.segment_address = struct.unpack('<HH', self.data)
+class CallInstruction(Instruction):
+    __slots__ = ('offset', 'segment_address')
+
+    def __init__(self, program, offset):
+        self.offset, self.segment_address = struct.unpack_from('<HH', program, offset)
         self.segment = None
 
     def __str__(self):
@@ -1122,7 +1284,9 @@ class CallInstruction:
         return 5
 
 
-class PushfInstruction:
+class PushfInstruction(Instruction):
+    __slots__ = ()
+
     def __init__(self):
         pass
 
@@ -1133,7 +1297,9 @@ class PushfInstruction:
         return 1
 
 
-class PopfInstruction:
+class PopfInstruction(Instruction):
+    __slots__ = ()
+
     def __init__(self):
         pass
 
@@ -1144,10 +1310,12 @@ class PopfInstruction:
         return 1
 
 
-class MoveAlMem8Instruction:
-    def __init__(self, data):
-        self.source = Immediate16(struct.unpack('<H', data)[0])
-        self.destination = Register(0, False)
+class MoveAlMem8Instruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate16(struct.unpack_from('<H', program, offset)[0])
+        self.destination = Register.get(0, False)
 
     def __str__(self):
         return 'mov %s, %s' % (self.destination, self.source)
@@ -1156,11 +1324,13 @@ class MoveAlMem8Instruction:
         return 3
 
 
-class MoveAxMem16Instruction:
-    def __init__(self, data):
-        self.source = Immediate16(struct.unpack('<H', data)[0])
+class MoveAxMem16Instruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate16(struct.unpack_from('<H', program, offset)[0])
         self.segment = None
-        self.destination = Register(0, True)
+        self.destination = Register.get(0, True)
 
     def __str__(self):
         return 'mov %s, %s%s' % (self.destination, self.get_segment(), self.source)
@@ -1172,10 +1342,12 @@ class MoveAxMem16Instruction:
         return 3
 
 
-class MoveMem8AlInstruction:
-    def __init__(self, data):
-        self.destination = Immediate8(struct.unpack('B', data)[0])
-        self.source = Register(0, False)
+class MoveMem8AlInstruction(Instruction):
+    __slots__ = ('destination', 'source')
+
+    def __init__(self, program, offset):
+        self.destination = Immediate8.get(struct.unpack_from('B', program, offset)[0])
+        self.source = Register.get(0, False)
 
     def __str__(self):
         return 'mov %s, %s' % (self.destination, self.source)
@@ -1184,10 +1356,12 @@ class MoveMem8AlInstruction:
         return 3
 
 
-class MoveMem16AxInstruction:
-    def __init__(self, data):
-        self.destination = Immediate16(struct.unpack('<H', data)[0])
-        self.source = Register(0, True)
+class MoveMem16AxInstruction(Instruction):
+    __slots__ = ('destination', 'source')
+
+    def __init__(self, program, offset):
+        self.destination = Immediate16(struct.unpack_from('<H', program, offset)[0])
+        self.source = Register.get(0, True)
 
     def __str__(self):
         return 'mov %s, %s' % (self.destination, self.source)
@@ -1196,7 +1370,9 @@ class MoveMem16AxInstruction:
         return 3
 
 
-class MovsInstruction:
+class MovsInstruction(Instruction):
+    __slots__ = ('word',)
+
     def __init__(self, word):
         self.word = word
 
@@ -1210,7 +1386,9 @@ class MovsInstruction:
         return 1
 
 
-class CmpsInstruction:
+class CmpsInstruction(Instruction):
+    __slots__ = ('word',)
+
     def __init__(self, word):
         self.word = word
 
@@ -1224,7 +1402,9 @@ class CmpsInstruction:
         return 1
 
 
-class StosInstruction:
+class StosInstruction(Instruction):
+    __slots__ = ('word',)
+
     def __init__(self, word):
         self.word = word
 
@@ -1238,7 +1418,9 @@ class StosInstruction:
         return 1
 
 
-class LodsInstruction:
+class LodsInstruction(Instruction):
+    __slots__ = ('word',)
+
     def __init__(self, word):
         self.word = word
         self.segment = 'ds'
@@ -1253,10 +1435,12 @@ class LodsInstruction:
         return 1
 
 
-class MoveAlInstruction:
-    def __init__(self, data):
-        self.source = Immediate8(struct.unpack('B', data)[0])
-        self.destination = Register(0, False)
+class MoveAlInstruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate8.get(struct.unpack_from('B', program, offset)[0])
+        self.destination = Register.get(0, False)
 
     def __str__(self):
         return 'mov %s, %s' % (self.destination, self.source)
@@ -1265,10 +1449,12 @@ class MoveAlInstruction:
         return 2
 
 
-class MoveCLInstruction:
-    def __init__(self, data):
-        self.source = Immediate8(struct.unpack('B', data)[0])
-        self.destination = Register(1, False)
+class MoveCLInstruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate8.get(struct.unpack_from('B', program, offset)[0])
+        self.destination = Register.get(1, False)
 
     def __str__(self):
         return 'mov %s, %s' % (self.destination, self.source)
@@ -1277,10 +1463,12 @@ class MoveCLInstruction:
         return 2
 
 
-class MoveDLInstruction:
-    def __init__(self, data):
-        self.source = Immediate8(struct.unpack('B', data)[0])
-        self.destination = Register(2, False)
+class MoveDLInstruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate8.get(struct.unpack_from('B', program, offset)[0])
+        self.destination = Register.get(2, False)
 
     def __str__(self):
         return 'mov %s, %s' % (self.destination, self.source)
@@ -1289,10 +1477,12 @@ class MoveDLInstruction:
         return 2
 
 
-class MoveBLInstruction:
-    def __init__(self, data):
-        self.source = Immediate8(struct.unpack('B', data)[0])
-        self.destination = Register(3, False)
+class MoveBLInstruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate8.get(struct.unpack_from('B', program, offset)[0])
+        self.destination = Register.get(3, False)
 
     def __str__(self):
         return 'mov %s, %s' % (self.destination, self.source)
@@ -1301,10 +1491,12 @@ class MoveBLInstruction:
         return 2
 
 
-class MoveAhInstruction:
-    def __init__(self, data):
-        self.source = Immediate8(struct.unpack('B', data)[0])
-        self.destination = Register(4, False)
+class MoveAhInstruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate8.get(struct.unpack_from('B', program, offset)[0])
+        self.destination = Register.get(4, False)
 
     def __str__(self):
         return 'mov %s, %s' % (self.destination, self.source)
@@ -1313,10 +1505,12 @@ class MoveAhInstruction:
         return 2
 
 
-class MoveChInstruction:
-    def __init__(self, data):
-        self.source = Immediate8(struct.unpack('B', data)[0])
-        self.destination = Register(5, False)
+class MoveChInstruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate8.get(struct.unpack_from('B', program, offset)[0])
+        self.destination = Register.get(5, False)
 
     def __str__(self):
         return 'mov %s, %s' % (self.destination, self.source)
@@ -1325,10 +1519,12 @@ class MoveChInstruction:
         return 2
 
 
-class MoveDhInstruction:
-    def __init__(self, data):
-        self.source = Immediate8(struct.unpack('B', data)[0])
-        self.destination = Register(6, False)
+class MoveDhInstruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate8.get(struct.unpack_from('B', program, offset)[0])
+        self.destination = Register.get(6, False)
 
     def __str__(self):
         return 'mov %s, %s' % (self.destination, self.source)
@@ -1337,10 +1533,12 @@ class MoveDhInstruction:
         return 2
 
 
-class MoveBhInstruction:
-    def __init__(self, data):
-        self.source = Immediate8(struct.unpack('B', data)[0])
-        self.destination = Register(7, False)
+class MoveBhInstruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate8.get(struct.unpack_from('B', program, offset)[0])
+        self.destination = Register.get(7, False)
 
     def __str__(self):
         return 'mov %s, %s' % (self.destination, self.source)
@@ -1349,10 +1547,12 @@ class MoveBhInstruction:
         return 2
 
 
-class MoveAXInstruction:
-    def __init__(self, data):
-        self.source = Immediate16(struct.unpack('<H', data)[0])
-        self.destination = Register(0, True)
+class MoveAXInstruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate16(struct.unpack_from('<H', program, offset)[0])
+        self.destination = Register.get(0, True)
 
     def __str__(self):
         return 'mov %s, %s' % (self.destination, self.source)
@@ -1361,10 +1561,12 @@ class MoveAXInstruction:
         return 3
 
 
-class MoveCXInstruction:
-    def __init__(self, data):
-        self.source = Immediate16(struct.unpack('<H', data)[0])
-        self.destination = Register(1, True)
+class MoveCXInstruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate16(struct.unpack_from('<H', program, offset)[0])
+        self.destination = Register.get(1, True)
 
     def __str__(self):
         return 'mov %s, %s' % (self.destination, self.source)
@@ -1373,10 +1575,12 @@ class MoveCXInstruction:
         return 3
 
 
-class MoveDXInstruction:
-    def __init__(self, data):
-        self.source = Immediate16(struct.unpack('<H', data)[0])
-        self.destination = Register(2, True)
+class MoveDXInstruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate16(struct.unpack_from('<H', program, offset)[0])
+        self.destination = Register.get(2, True)
 
     def __str__(self):
         return 'mov %s, %s' % (self.destination, self.source)
@@ -1385,10 +1589,12 @@ class MoveDXInstruction:
         return 3
 
 
-class MoveBXInstruction:
-    def __init__(self, data):
-        self.source = Immediate16(struct.unpack('<H', data)[0])
-        self.destination = Register(3, True)
+class MoveBXInstruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate16(struct.unpack_from('<H', program, offset)[0])
+        self.destination = Register.get(3, True)
 
     def __str__(self):
         return 'mov %s, %s' % (self.destination, self.source)
@@ -1397,10 +1603,12 @@ class MoveBXInstruction:
         return 3
 
 
-class MoveSPInstruction:
-    def __init__(self, data):
-        self.source = Immediate16(struct.unpack('<H', data)[0])
-        self.destination = Register(4, True)
+class MoveSPInstruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate16(struct.unpack_from('<H', program, offset)[0])
+        self.destination = Register.get(4, True)
 
     def __str__(self):
         return 'mov %s, %s' % (self.destination, self.source)
@@ -1409,10 +1617,12 @@ class MoveSPInstruction:
         return 3
 
 
-class MoveBPInstruction:
-    def __init__(self, data):
-        self.source = Immediate16(struct.unpack('<H', data)[0])
-        self.destination = Register(5, True)
+class MoveBPInstruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate16(struct.unpack_from('<H', program, offset)[0])
+        self.destination = Register.get(5, True)
 
     def __str__(self):
         return 'mov %s, %s' % (self.destination, self.source)
@@ -1421,10 +1631,12 @@ class MoveBPInstruction:
         return 3
 
 
-class MoveSIInstruction:
-    def __init__(self, data):
-        self.source = Immediate16(struct.unpack('<H', data)[0])
-        self.destination = Register(6, True)
+class MoveSIInstruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate16(struct.unpack_from('<H', program, offset)[0])
+        self.destination = Register.get(6, True)
 
     def __str__(self):
         return 'mov %s, %s' % (self.destination, self.source)
@@ -1433,10 +1645,12 @@ class MoveSIInstruction:
         return 3
 
 
-class MoveDIInstruction:
-    def __init__(self, data):
-        self.source = Immediate16(struct.unpack('<H', data)[0])
-        self.destination = Register(7, True)
+class MoveDIInstruction(Instruction):
+    __slots__ = ('source', 'destination')
+
+    def __init__(self, program, offset):
+        self.source = Immediate16(struct.unpack_from('<H', program, offset)[0])
+        self.destination = Register.get(7, True)
 
     def __str__(self):
         return 'mov %s, %s' % (self.destination, self.source)
@@ -1445,7 +1659,9 @@ class MoveDIInstruction:
         return 3
 
 
-class ReturnIntraInstruction:
+class ReturnIntraInstruction(Instruction):
+    __slots__ = ()
+
     def __init__(self):
         pass
 
@@ -1457,6 +1673,8 @@ class ReturnIntraInstruction:
 
 
 class LesInstruction(RegToRegMemBaseInstruction):
+    __slots__ = ()
+
     def is_word(self):
         return True
 
@@ -1468,6 +1686,8 @@ class LesInstruction(RegToRegMemBaseInstruction):
 
 
 class LdsInstruction(RegToRegMemBaseInstruction):
+    __slots__ = ()
+
     def is_word(self):
         return True
 
@@ -1479,8 +1699,10 @@ class LdsInstruction(RegToRegMemBaseInstruction):
 
 
 class MovMem8Imm8Instruction(RegToRegMemBaseInstruction):
-    def get_source(self):
-        return Immediate8(struct.unpack('B', self.data[:1])[0])
+    __slots__ = ()
+
+    def get_source(self, program, offset):
+        return Immediate8.get(struct.unpack_from('B', program, offset)[0])
 
     def __str__(self):
         return 'mov %s, %s' % (self.destination, self.source)
@@ -1489,12 +1711,14 @@ class MovMem8Imm8Instruction(RegToRegMemBaseInstruction):
         return False
 
     def __len__(self):
-        return 1 + len(self.modreg) + 1
+        return 1 + self.modreg.length + 1
 
 
 class MovMem16Imm16Instruction(RegToRegMemBaseInstruction):
-    def get_source(self):
-        return Immediate16(struct.unpack('<H', self.data[:2])[0])
+    __slots__ = ()
+
+    def get_source(self, program, offset):
+        return Immediate16(struct.unpack_from('<H', program, offset)[0])
 
     def __str__(self):
         return 'mov %s, %s' % (self.destination, self.source)
@@ -1503,12 +1727,14 @@ class MovMem16Imm16Instruction(RegToRegMemBaseInstruction):
         return False
 
     def __len__(self):
-        return 1 + len(self.modreg) + 2
+        return 1 + self.modreg.length + 2
+
 
+class ReturnImm16Instruction(Instruction):
+    __slots__ = ('immediate16',)
 
-class ReturnImm16Instruction:
-    def __init__(self, data):
-        self.immediate16 = Immediate16(struct.unpack('<H', data)[0])
+    def __init__(self, program, offset):
+        self.immediate16 = Immediate16(struct.unpack_from('<H', program, offset)[0])
 
     def __str__(self):
         return 'ret %s' % self.immediate16
@@ -1517,7 +1743,9 @@ class ReturnImm16Instruction:
         return 3
 
 
-class ReturnInstruction:
+class ReturnInstruction(Instruction):
+    __slots__ = ()
+
     def __init__(self):
         pass
 
@@ -1528,9 +1756,11 @@ class ReturnInstruction:
         return 1
 
 
-class InterruptInstruction:
-    def __init__(self, data):
-        self.immediate8 = Immediate8(struct.unpack('B', data)[0])
+class InterruptInstruction(Instruction):
+    __slots__ = ('immediate8',)
+
+    def __init__(self, program, offset):
+        self.immediate8 = Immediate8.get(struct.unpack_from('B', program, offset)[0])
 
     def __str__(self):
         return 'int %s' % self.immediate8
@@ -1539,41 +1769,36 @@ class InterruptInstruction:
         return 2
 
 
+SHIFT_MNEMONICS = ('rol', 'ror', 'rcl', 'rcr', 'shl', 'shr', None, 'sar')
+
+
 class ShiftInstruction(RegToRegMemBaseInstruction):
+    __slots__ = ()
+
     def get_destination(self):
         return self.modreg
 
-    def get_source(self):
+    def get_source(self, program, offset):
         if self.direction:
-            return Register(1, 0)
+            return Register.get(1, 0)
         else:
-            return Immediate8(1)
+            return Immediate8.get(1)
 
     def __str__(self):
-        if self.modreg.reg == 0:
-            return 'rol %s, %s' % (self.destination, self.source)
-        elif self.modreg.reg == 1:
-            return 'ror %s, %s' % (self.destination, self.source)
-        elif self.modreg.reg == 2:
-            return 'rcl %s, %s' % (self.destination, self.source)
-        elif self.modreg.reg == 3:
-            return 'rcr %s, %s' % (self.destination, self.source)
-        elif self.modreg.reg == 4:
-            return 'shl %s, %s' % (self.destination, self.source)
-        elif self.modreg.reg == 5:
-            return 'shr %s, %s' % (self.destination, self.source)
-        elif self.modreg.reg == 7:
-            return 'sar %s, %s' % (self.destination, self.source)
-
-        raise Exception('Unimplemented shift instruction', self.modreg)
+        mnemonic = SHIFT_MNEMONICS[self.modreg.reg]
+        if mnemonic is None:
+            raise Exception('Unimplemented shift instruction', self.modreg)
+        return '%s %s, %s' % (mnemonic, self.destination, self.source)
 
     def __len__(self):
         return 2
 
 
-class LoopInstruction:
-    def __init__(self, data):
-        self.immediate8 = Immediate8(struct.unpack('B', data)[0])
+class LoopInstruction(Instruction):
+    __slots__ = ('immediate8',)
+
+    def __init__(self, program, offset):
+        self.immediate8 = Immediate8.get(struct.unpack_from('B', program, offset)[0])
 
     def __str__(self):
         return 'loop %s' % self.immediate8
@@ -1582,9 +1807,11 @@ class LoopInstruction:
         return 2
 
 
-class JcxzInstruction:
-    def __init__(self, data):
-        self.immediate8 = Immediate8(struct.unpack('B', data)[0])
+class JcxzInstruction(Instruction):
+    __slots__ = ('immediate8',)
+
+    def __init__(self, program, offset):
+        self.immediate8 = Immediate8.get(struct.unpack_from('B', program, offset)[0])
 
     def __str__(self):
         return 'jcxz %s' % self.immediate8
@@ -1593,10 +1820,11 @@ class JcxzInstruction:
         return 2
 
 
-class CallNearInstruction:
-    def __init__(self, data):
-        self.data = data
-        self.offset = struct.unpack('<h', self.data)[0]
+class CallNearInstruction(Instruction):
+    __slots__ = ('offset',)
+
+    def __init__(self, program, offset):
+        self.offset = struct.unpack_from('<h', program, offset)[0]
 
     def __str__(self):
         return 'call %04Xh' % self.offset
@@ -1605,10 +1833,11 @@ class CallNearInstruction:
         return 3
 
 
-class JumpNearInstruction:
-    def __init__(self, data):
-        self.data = data
-        self.offset = struct.unpack('<h', self.data)[0]
+class JumpNearInstruction(Instruction):
+    __slots__ = ('offset',)
+
+    def __init__(self, program, offset):
+        self.offset = struct.unpack_from('<h', program, offset)[0]
 
     def __str__(self):
         return 'jmp %04x' % self.offset
@@ -1617,10 +1846,11 @@ class JumpNearInstruction:
         return 3
 
 
-class JumpLongInstruction:
-    def __init__(self, data):
-        self.data = data
-        (self.offset, self.segment) = struct.unpack('<HH', self.data)
+class JumpLongInstruction(Instruction):
+    __slots__ = ('offset',)
+
+    def __init__(self, program, offset):
+        (self.offset, self.segment) = struct.unpack_from('<HH', program, offset)
 
     def __str__(self):
         return 'jmp %04x:%04x' % (self.segment, self.offset)
@@ -1629,10 +1859,11 @@ class JumpLongInstruction:
         return 5
 
 
-class JumpShortInstruction:
-    def __init__(self, data):
-        self.data = data
-        self.offset = struct.unpack('b', self.data)[0]
+class JumpShortInstruction(Instruction):
+    __slots__ = ('offset',)
+
+    def __init__(self, program, offset):
+        self.offset = struct.unpack_from('b', program, offset)[0]
 
     def __str__(self):
         return 'jmp %02x' % self.offset
@@ -1641,7 +1872,9 @@ class JumpShortInstruction:
         return 2
 
 
-class OutAlDxInstruction:
+class OutAlDxInstruction(Instruction):
+    __slots__ = ()
+
     def __str__(self):
         return 'out al, dx'
 
@@ -1649,7 +1882,9 @@ class OutAlDxInstruction:
         return 1
 
 
-class RepInstruction:
+class RepInstruction(Instruction):
+    __slots__ = ('instruction',)
+
     def __init__(self, instruction):
         self.instruction = instruction
 
@@ -1660,7 +1895,9 @@ class RepInstruction:
         return 1 + len(self.instruction)
 
 
-class CMCInstruction:
+class CMCInstruction(Instruction):
+    __slots__ = ()
+
     def __init__(self):
         pass
 
@@ -1671,7 +1908,9 @@ class CMCInstruction:
         return 1
 
 
-class NotInstruction:
+class NotInstruction(Instruction):
+    __slots__ = ('modreg',)
+
     def __init__(self, modreg):
         self.modreg = modreg
 
@@ -1679,25 +1918,29 @@ class NotInstruction:
         return 'not %s' % self.modreg
 
     def __len__(self):
-        return 1 + len(self.modreg)
+        return 1 + self.modreg.length
 
 
-class TestImmInstruction:
-    def __init__(self, modreg):
+class TestImmInstruction(Instruction):
+    __slots__ = ('destination', 'source')
+
+    def __init__(self, program, offset, modreg):
         self.destination = modreg
         if modreg.word:
-            self.source = Immediate16(struct.unpack('<H', modreg.extra[:2])[0])
+            self.source = Immediate16(struct.unpack_from('<H', program, offset)[0])
         else:
-            self.source = Immediate8(struct.unpack('B', modreg.extra[:1])[0])
+            self.source = Immediate8.get(struct.unpack_from('B', program, offset)[0])
 
     def __str__(self):
         return 'not %s, %s' % (self.destination, self.source)
 
     def __len__(self):
-        return 1 + len(self.destination) + len(self.source)
+        return 1 + self.destination.length + len(self.source)
 
 
-class NegInstruction:
+class NegInstruction(Instruction):
+    __slots__ = ('modreg',)
+
     def __init__(self, modreg):
         self.modreg = modreg
 
@@ -1705,10 +1948,12 @@ class NegInstruction:
         return 'not %s' % self.modreg
 
     def __len__(self):
-        return 1 + len(self.modreg)
+        return 1 + self.modreg.length
+
 
+class DivInstruction(Instruction):
+    __slots__ = ('modreg',)
 
-class DivInstruction:
     def __init__(self, modreg):
         self.modreg = modreg
 
@@ -1716,10 +1961,12 @@ class DivInstruction:
         return 'div %s' % self.modreg
 
     def __len__(self):
-        return 1 + len(self.modreg)
+        return 1 + self.modreg.length
 
 
-class IdivInstruction:
+class IdivInstruction(Instruction):
+    __slots__ = ('modreg',)
+
     def __init__(self, modreg):
         self.modreg = modreg
 
@@ -1727,10 +1974,12 @@ class IdivInstruction:
         return 'idiv %s' % self.modreg
 
     def __len__(self):
-        return 1 + len(self.modreg)
+        return 1 + self.modreg.length
+
 
+class MulInstruction(Instruction):
+    __slots__ = ('modreg',)
 
-class MulInstruction:
     def __init__(self, modreg):
         self.modreg = modreg
 
@@ -1738,10 +1987,12 @@ class MulInstruction:
         return 'mul %s' % self.modreg
 
     def __len__(self):
-        return 1 + len(self.modreg)
+        return 1 + self.modreg.length
+
 
+class ImulInstruction(Instruction):
+    __slots__ = ('modreg',)
 
-class ImulInstruction:
     def __init__(self, modreg):
         self.modreg = modreg
 
@@ -1749,30 +2000,31 @@ class ImulInstruction:
         return 'imul %s' % self.modreg
 
     def __len__(self):
-        return 1 + len(self.modreg)
+        return 1 + self.modreg.length
 
 
-def Grp1Instruction(data):
-    modreg = ModReg(data[1], data[0] & 0x01, data[2:])
+def _modreg_only(cls):
+    def decode(program, offset, modreg):
+        return cls(modreg)
+    return decode
 
-    if modreg.reg == 0:
-        return TestImmInstruction(modreg)
-    elif modreg.reg == 2:
-        return NotInstruction(modreg)
-    elif modreg.reg == 3:
-        return NegInstruction(modreg)
-    elif modreg.reg == 4:
-        return MulInstruction(modreg)
-    elif modreg.reg == 5:
-        return ImulInstruction(modreg)
-    elif modreg.reg == 6:
-        return DivInstruction(modreg)
-    elif modreg.reg == 7:
-        return IdivInstruction(modreg)
-    raise Exception('Unimplemented', modreg)
 
+GRP1_INSTRUCTIONS = (TestImmInstruction, None, _modreg_only(NotInstruction), _modreg_only(NegInstruction),
+                     _modreg_only(MulInstruction), _modreg_only(ImulInstruction),
+                     _modreg_only(DivInstruction), _modreg_only(IdivInstruction))
+
+
+def Grp1Instruction(program, offset):
+    modreg = ModReg(program, offset + 1, program[offset] & 0x01)
+    instruction = GRP1_INSTRUCTIONS[modreg.reg]
+    if instruction is None:
+        raise Exception('Unimplemented', modreg)
+    return instruction(program, offset + 2, modreg)
+
+
+class CLCInstruction(Instruction):
+    __slots__ = ()
 
-class CLCInstruction:
     def __init__(self):
         pass
 
@@ -1783,7 +2035,9 @@ class CLCInstruction:
         return 1
 
 
-class STCInstruction:
+class STCInstruction(Instruction):
+    __slots__ = ()
+
     def __init__(self):
         pass
 
@@ -1794,7 +2048,9 @@ class STCInstruction:
         return 1
 
 
-class CLIInstruction:
+class CLIInstruction(Instruction):
+    __slots__ = ()
+
     def __init__(self):
         pass
 
@@ -1805,7 +2061,9 @@ class CLIInstruction:
         return 1
 
 
-class STIInstruction:
+class STIInstruction(Instruction):
+    __slots__ = ()
+
     def __init__(self):
         pass
 
@@ -1816,7 +2074,9 @@ class STIInstruction:
         return 1
 
 
-class CLDInstruction:
+class CLDInstruction(Instruction):
+    __slots__ = ()
+
     def __init__(self):
         pass
 
@@ -1827,7 +2087,9 @@ class CLDInstruction:
         return 1
 
 
-class STDInstruction:
+class STDInstruction(Instruction):
+    __slots__ = ()
+
     def __init__(self):
         pass
 
@@ -1838,7 +2100,9 @@ class STDInstruction:
         return 1
 
 
-class PushMem16Instruction:
+class PushMem16Instruction(Instruction):
+    __slots__ = ('modreg',)
+
     def __init__(self, modreg):
         self.modreg = modreg
 
@@ -1846,10 +2110,12 @@ class PushMem16Instruction:
         return 'push %s' % self.modreg
 
     def __len__(self):
-        return 1 + len(self.modreg)
+        return 1 + self.modreg.length
 
 
-class IncInstruction:
+class IncInstruction(Instruction):
+    __slots__ = ('modreg',)
+
     def __init__(self, modreg):
         self.modreg = modreg
 
@@ -1857,10 +2123,12 @@ class IncInstruction:
         return 'inc %s' % self.modreg
 
     def __len__(self):
-        return 1 + len(self.modreg)
+        return 1 + self.modreg.length
+
 
+class DecInstruction(Instruction):
+    __slots__ = ('modreg',)
 
-class DecInstruction:
     def __init__(self, modreg):
         self.modreg = modreg
 
@@ -1868,458 +2136,267 @@ class DecInstruction:
         return 'dec %s' % self.modreg
 
     def __len__(self):
-        return 1 + len(self.modreg)
+        return 1 + self.modreg.length
 
 
 class Grp2CallNearInstruction(CallNearInstruction):
+    __slots__ = ()
+
     def __len__(self):
         return 4
 
 
-def Grp2Instruction(data):
-    modreg = ModReg(data[1], data[0] & 0x01, data[2:])
+class JumpIndirectInstruction(Instruction):
+    __slots__ = ('modreg',)
 
-    if modreg.reg == 0:
-        return IncInstruction(modreg)
-    elif modreg.reg == 1:
-        return DecInstruction(modreg)
-    elif modreg.reg == 3:
-        return Grp2CallNearInstruction(modreg.extra)
-    elif modreg.reg == 6:
-        return PushMem16Instruction(modreg)
-    raise Exception('Grp2Instruction', modreg)
+    def __init__(self, modreg):
+        self.modreg = modreg
 
+    def __str__(self):
+        return 'jmp %s' % self.modreg
 
-class Instruction:
-    @staticmethod
+    def __len__(self):
+        return 1 + self.modreg.length
+
+
+class JumpFarIndirectInstruction(JumpIndirectInstruction):
+    __slots__ = ()
+
+    def __str__(self):
+        return 'jmp far %s' % self.modreg
+
+
+def _grp2_call_near(program, offset, modreg):
+    return Grp2CallNearInstruction(program, offset)
+
+
+GRP2_INSTRUCTIONS = (_modreg_only(IncInstruction), _modreg_only(DecInstruction), None, _grp2_call_near,
+                     _modreg_only(JumpIndirectInstruction), _modreg_only(JumpFarIndirectInstruction),
+                     _modreg_only(PushMem16Instruction), None)
+GRP2_BYTE_INSTRUCTIONS = (_modreg_only(IncInstruction), _modreg_only(DecInstruction), None, None, None, None, None,
+                          None)
+
+
+def Grp2Instruction(program, offset):
+    modreg = ModReg(program, offset + 1, program[offset] & 0x01)
+    instruction = (GRP2_INSTRUCTIONS if program[offset] & 0x01 else GRP2_BYTE_INSTRUCTIONS)[modreg.reg]
+    if instruction is None:
+        raise Exception('Grp2Instruction', modreg)
+    return instruction(program, offset + 2, modreg)
+
+
+def _unimplemented(program, offset):
+    raise Exception('Unimplemented op-code: %x' % program[offset])
+
+
+def _implied(cls, *args, **kwargs):
+    def decode(program, offset):
+        return cls(*args, **kwargs)
+    return decode
+
+
+def _operands(cls, start):
+    def decode(program, offset):
+        return cls(program, offset + start)
+    return decode
+
+
+def _prefix(cls):
     def decode(program, offset):
-        code = program[offset]
-        if 0x0 <= code <= 0x3:
-            return AddInstruction(program[offset:offset+5])
-        elif code == 0x4:
-            return AddAlInstruction(program[offset+1:offset+2])
-        elif code == 0x5:
-            return AddAxInstruction(program[offset+1:offset+3])
-        elif code == 0x6:
-            return PushESInstruction()
-        elif code == 0x7:
-            return PopESInstruction()
-        elif 0x8 <= code <= 0xb:
-            return OrInstruction(program[offset:offset+5])
-        elif code == 0xc:
-            return OrAlImm8Instruction(program[offset+1:offset+2])
-        elif code == 0xd:
-            return OrAxImm16Instruction(program[offset+1:offset+3])
-        elif code == 0xe:
-            return PushCSInstruction()
-        elif code == 0xf:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif 0x10 <= code <= 0x13:
-            return AdcInstruction(program[offset:offset+4])
-        elif code == 0x14:
-            return AdcAlImm8Instruction(program[offset+1:offset+2])
-        elif code == 0x15:
-            return AdcAxImm16Instruction(program[offset+1:offset+3])
-        elif code == 0x16:
-            return PushSSInstruction()
-        elif code == 0x17:
-            return PopSSInstruction()
-        elif 0x18 <= code <= 0x1b:
-            return SBBInstruction(program[offset:offset+4])
-        elif code == 0x1c:
-            return SBBAlImm8Instruction(program[offset+1:offset+2])
-        elif code == 0x1d:
-            return SBBAxImm16Instruction(program[offset+1:offset+3])
-        elif code == 0x1e:
-            return PushDSInstruction()
-        elif code == 0x1f:
-            return PopDSInstruction()
-        elif 0x20 <= code <= 0x23:
-            return AndInstruction(program[offset:offset+5])
-        elif code == 0x24:
-            return AndALImm8Instruction(program[offset+1:offset+2])
-        elif code == 0x25:
-            return AndAXImm16Instruction(program[offset+1:offset+3])
-        elif code == 0x26:
-            return ESSegmentOverride(Instruction.decode(program, offset+1))
-        elif code == 0x27:
-            return DAAInstruction()
-        elif 0x28 <= code <= 0x2b:
-            return SubInstruction(program[offset:offset+5])
-        elif code == 0x2c:
-            return SubAlImm8Instruction(program[offset+1:offset+2])
-        elif code == 0x2d:
-            return SubAxImm16Instruction(program[offset+1:offset+3])
-        elif code == 0x2e:
-            return CSSegmentOverride(Instruction.decode(program, offset+1))
-        elif code == 0x2f:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif 0x30 <= code <= 0x33:
-            return XorInstruction(program[offset:offset+5])
-        elif code == 0x34:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0x35:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0x36:
-            return SSSegmentOverride(Instruction.decode(program, offset+1))
-        elif code == 0x37:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0x38:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0x39:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0x3a:
-            return CmpInstruction(program[offset:offset+5])
-        elif code == 0x3b:
-            return CmpInstruction(program[offset:offset+5])
-        elif code == 0x3c:
-            return CmpAlImm8Instruction(program[offset+1:offset+2])
-        elif code == 0x3d:
-            return CmpAxImm16Instruction(program[offset+1:offset+3])
-        elif code == 0x3e:
-            return DSSegmentOverride(Instruction.decode(program, offset+1))
-        elif code == 0x3f:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0x40:
-            return IncAXInstruction()
-        elif code == 0x41:
-            return IncCXInstruction()
-        elif code == 0x42:
-            return IncDXInstruction()
-        elif code == 0x43:
-            return IncBXInstruction()
-        elif code == 0x44:
-            return IncSPInstruction()
-        elif code == 0x45:
-            return IncBPInstruction()
-        elif code == 0x46:
-            return IncSIInstruction()
-        elif code == 0x47:
-            return IncDIInstruction()
-        elif code == 0x48:
-            return DecAXInstruction()
-        elif code == 0x49:
-            return DecCXInstruction()
-        elif code == 0x4a:
-            return DecDXInstruction()
-        elif code == 0x4b:
-            return DecBXInstruction()
-        elif code == 0x4c:
-            return DecSPInstruction()
-        elif code == 0x4d:
-            return DecBPInstruction()
-        elif code == 0x4e:
-            return DecSIInstruction()
-        elif code == 0x4f:
-            return DecDIInstruction()
-        elif 0x50 <= code <= 0x57:
-            return PushInstruction(code-0x50)
-        elif 0x58 <= code <= 0x5f:
-            return PopInstruction(code-0x58)
-        elif code == 0x60:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0x61:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0x62:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0x63:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0x64:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0x65:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0x66:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0x67:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0x68:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0x69:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0x6a:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0x6b:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0x6c:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0x6d:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0x6e:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0x6f:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0x70:
-            return JoInstruction(program[offset+1:offset+2])
-        elif code == 0x71:
-            return JnoInstruction(program[offset+1:offset+2])
-        elif code == 0x72:
-            return JbInstruction(program[offset+1:offset+2])
-        elif code == 0x73:
-            return JnbInstruction(program[offset+1:offset+2])
-        elif code == 0x74:
-            return JzInstruction(program[offset+1:offset+2])
-        elif code == 0x75:
-            return JnzInstruction(program[offset + 1:offset + 2])
-        elif code == 0x76:
-            return JbeInstruction(program[offset+1:offset+2])
-        elif code == 0x77:
-            return JaInstruction(program[offset+1:offset+2])
-        elif code == 0x78:
-            return JsInstruction(program[offset+1:offset+2])
-        elif code == 0x79:
-            return JnsInstruction(program[offset+1:offset+2])
-        elif code == 0x7a:
-            return JpeInstruction(program[offset+1:offset+2])
-        elif code == 0x7b:
-            return JpoInstruction(program[offset+1:offset+2])
-        elif code == 0x7c:
-            return JlInstruction(program[offset+1:offset+2])
-        elif code == 0x7d:
-            return JgeInstruction(program[offset+1:offset+2])
-        elif code == 0x7e:
-            return JleInstruction(program[offset+1:offset+2])
-        elif code == 0x7f:
-            return JgInstruction(program[offset+1:offset+2])
-        elif 0x80 <= code <= 0x83:
-            return IntermediateInstruction(program[offset:offset+6])
-        elif code == 0x84:
-            return TestInstruction(program[offset:offset+5])
-        elif code == 0x85:
-            return TestInstruction(program[offset:offset+5])
-        elif code == 0x86:
-            return XchgInstruction(program[offset:offset+6])
-        elif code == 0x87:
-            return XchgInstruction(program[offset:offset+6])
-        elif code == 0x88:
-            return MovInstruction(program[offset:offset+6])
-        elif code == 0x89:
-            return MovInstruction(program[offset:offset+6])
-        elif code == 0x8a:
-            return MovInstruction(program[offset:offset+6])
-        elif code == 0x8b:
-            return MovInstruction(program[offset:offset+6])
-        elif code == 0x8c:
-            return MoveSegRegInstruction(program[offset:offset+6])
-        elif code == 0x8d:
-            return LoadEffectiveAddressInstruction(program[offset:offset+6])
-        elif code == 0x8e:
-            return MoveSegRegInstruction(program[offset:offset+6])
-        elif code == 0x8f:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0x90:
-            return NopInstruction()
-        elif code == 0x91:
-            return XchgAxCxInstruction()
-        elif code == 0x92:
-            return XchgAxDxInstruction()
-        elif code == 0x93:
-            return XchgAxBxInstruction()
-        elif code == 0x94:
-            return XchgAxSpInstruction()
-        elif code == 0x95:
-            return XchgAxBpInstruction()
-        elif code == 0x96:
-            return XchgAxSiInstruction()
-        elif code == 0x97:
-            return XchgAxDiInstruction()
-        elif code == 0x98:
-            return CbwInstruction()
-        elif code == 0x99:
-            return CwdInstruction()
-        elif code == 0x9a:
-            return CallInstruction(program[offset+1:offset+5])
-        elif code == 0x9b:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0x9c:
-            return PushfInstruction()
-        elif code == 0x9d:
-            return PopfInstruction()
-        elif code == 0x9e:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0x9f:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xa0:
-            return MoveAlMem8Instruction(program[offset+1:offset+3])
-        elif code == 0xa1:
-            return MoveAxMem16Instruction(program[offset + 1:offset + 3])
-        elif code == 0xa2:
-            return MoveMem8AlInstruction(program[offset+1:offset+2])
-        elif code == 0xa3:
-            return MoveMem16AxInstruction(program[offset + 1:offset + 3])
-        elif code == 0xa4:
-            return MovsInstruction(word=False)
-        elif code == 0xa5:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xa6:
-            return CmpsInstruction(word=False)
-        elif code == 0xa7:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xa8:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xa9:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xaa:
-            return StosInstruction(word=False)
-        elif code == 0xab:
-            return StosInstruction(word=True)
-        elif code == 0xac:
-            return LodsInstruction(word=False)
-        elif code == 0xad:
-            return LodsInstruction(word=True)
-        elif code == 0xae:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xaf:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xb0:
-            return MoveAlInstruction(program[offset + 1:offset + 2])
-        elif code == 0xb1:
-            return MoveCLInstruction(program[offset+1:offset+2])
-        elif code == 0xb2:
-            return MoveDLInstruction(program[offset+1:offset+2])
-        elif code == 0xb3:
-            return MoveBLInstruction(program[offset+1:offset+2])
-        elif code == 0xb4:
-            return MoveAhInstruction(program[offset+1:offset+2])
-        elif code == 0xb5:
-            return MoveChInstruction(program[offset+1:offset+2])
-        elif code == 0xb6:
-            return MoveDhInstruction(program[offset+1:offset+2])
-        elif code == 0xb7:
-            return MoveBhInstruction(program[offset+1:offset+2])
-        elif code == 0xb8:
-            return MoveAXInstruction(program[offset+1:offset+3])
-        elif code == 0xb9:
-            return MoveCXInstruction(program[offset+1:offset+3])
-        elif code == 0xba:
-            return MoveDXInstruction(program[offset+1:offset+3])
-        elif code == 0xbb:
-            return MoveBXInstruction(program[offset+1:offset+3])
-        elif code == 0xbc:
-            return MoveSPInstruction(program[offset+1:offset+3])
-        elif code == 0xbd:
-            return MoveBPInstruction(program[offset+1:offset+3])
-        elif code == 0xbe:
-            return MoveSIInstruction(program[offset+1:offset+3])
-        elif code == 0xbf:
-            return MoveDIInstruction(program[offset+1:offset+3])
-        elif code == 0xc0:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xc1:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xc2:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xc3:
-            return ReturnIntraInstruction()
-        elif code == 0xc4:
-            return LesInstruction(program[offset:offset+4])
-        elif code == 0xc5:
-            return LdsInstruction(program[offset:offset+3])
-        elif code == 0xc6:
-            return MovMem8Imm8Instruction(program[offset+0:offset+6])
-        elif code == 0xc7:
-            return MovMem16Imm16Instruction(program[offset:offset+6])
-        elif code == 0xc8:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xc9:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xca:
-            return ReturnImm16Instruction(program[offset+1:offset+3])
-        elif code == 0xcb:
-            return ReturnInstruction()
-        elif code == 0xcd:
-            return InterruptInstruction(program[offset+1:offset+2])
-        elif code == 0xce:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xcf:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif 0xd0 <= code <= 0xd3:
-            return ShiftInstruction(program[offset:offset+5])
-        elif code == 0xd4:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xd5:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xd6:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xd7:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xd8:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xd9:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xda:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xdb:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xdc:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xdd:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xde:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xdf:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xe0:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xe1:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xe2:
-            return LoopInstruction(program[offset+1:offset+2])
-        elif code == 0xe3:
-            return JcxzInstruction(program[offset+1:offset+2])
-        elif code == 0xe4:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xe5:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xe6:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xe7:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xe8:
-            return CallNearInstruction(program[offset+1:offset+3])
-        elif code == 0xe9:
-            return JumpNearInstruction(program[offset+1:offset+3])
-        elif code == 0xea:
-            return JumpLongInstruction(program[offset+1:offset+5])
-        elif code == 0xeb:
-            return JumpShortInstruction(program[offset+1:offset+2])
-        elif code == 0xec:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xed:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xee:
-            return OutAlDxInstruction()
-        elif code == 0xef:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xf0:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xf1:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xf2:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xf3:
-            return RepInstruction(Instruction.decode(program, offset+1))
-        elif code == 0xf4:
-            raise Exception('Unimplemented op-code: %x' % code)
-        elif code == 0xf5:
-            return CMCInstruction()
-        elif code == 0xf6:
-            return Grp1Instruction(program[offset:offset+5])
-        elif code == 0xf7:
-            return Grp1Instruction(program[offset:offset+5])
-        elif code == 0xf8:
-            return CLCInstruction()
-        elif code == 0xf9:
-            return STCInstruction()
-        elif code == 0xfa:
-            return CLIInstruction()
-        elif code == 0xfb:
-            return STIInstruction()
-        elif code == 0xfc:
-            return CLDInstruction()
-        elif code == 0xfd:
-            return STDInstruction()
-        elif code == 0xfe:
-            return Grp2Instruction(program[offset:offset+4])
-        elif code == 0xff:
-            return Grp2Instruction(program[offset:offset+4])
-        raise Exception('Unimplemented op-code: %x' % code)
+        return cls(Instruction.decode(program, offset + 1))
+    return decode
+
+
+OPCODES = {
+    0x00: _operands(AddInstruction, 0),
+    0x01: _operands(AddInstruction, 0),
+    0x02: _operands(AddInstruction, 0),
+    0x03: _operands(AddInstruction, 0),
+    0x04: _operands(AddAlInstruction, 1),
+    0x05: _operands(AddAxInstruction, 1),
+    0x06: _implied(PushESInstruction),
+    0x07: _implied(PopESInstruction),
+    0x08: _operands(OrInstruction, 0),
+    0x09: _operands(OrInstruction, 0),
+    0x0a: _operands(OrInstruction, 0),
+    0x0b: _operands(OrInstruction, 0),
+    0x0c: _operands(OrAlImm8Instruction, 1),
+    0x0d: _operands(OrAxImm16Instruction, 1),
+    0x0e: _implied(PushCSInstruction),
+    0x10: _operands(AdcInstruction, 0),
+    0x11: _operands(AdcInstruction, 0),
+    0x12: _operands(AdcInstruction, 0),
+    0x13: _operands(AdcInstruction, 0),
+    0x14: _operands(AdcAlImm8Instruction, 1),
+    0x15: _operands(AdcAxImm16Instruction, 1),
+    0x16: _implied(PushSSInstruction),
+    0x17: _implied(PopSSInstruction),
+    0x18: _operands(SBBInstruction, 0),
+    0x19: _operands(SBBInstruction, 0),
+    0x1a: _operands(SBBInstruction, 0),
+    0x1b: _operands(SBBInstruction, 0),
+    0x1c: _operands(SBBAlImm8Instruction, 1),
+    0x1d: _operands(SBBAxImm16Instruction, 1),
+    0x1e: _implied(PushDSInstruction),
+    0x1f: _implied(PopDSInstruction),
+    0x20: _operands(AndInstruction, 0),
+    0x21: _operands(AndInstruction, 0),
+    0x22: _operands(AndInstruction, 0),
+    0x23: _operands(AndInstruction, 0),
+    0x24: _operands(AndALImm8Instruction, 1),
+    0x25: _operands(AndAXImm16Instruction, 1),
+    0x26: _prefix(ESSegmentOverride),
+    0x27: _implied(DAAInstruction),
+    0x28: _operands(SubInstruction, 0),
+    0x29: _operands(SubInstruction, 0),
+    0x2a: _operands(SubInstruction, 0),
+    0x2b: _operands(SubInstruction, 0),
+    0x2c: _operands(SubAlImm8Instruction, 1),
+    0x2d: _operands(SubAxImm16Instruction, 1),
+    0x2e: _prefix(CSSegmentOverride),
+    0x30: _operands(XorInstruction, 0),
+    0x31: _operands(XorInstruction, 0),
+    0x32: _operands(XorInstruction, 0),
+    0x33: _operands(XorInstruction, 0),
+    0x36: _prefix(SSSegmentOverride),
+    0x3a: _operands(CmpInstruction, 0),
+    0x3b: _operands(CmpInstruction, 0),
+    0x3c: _operands(CmpAlImm8Instruction, 1),
+    0x3d: _operands(CmpAxImm16Instruction, 1),
+    0x3e: _prefix(DSSegmentOverride),
+    0x40: _implied(IncAXInstruction),
+    0x41: _implied(IncCXInstruction),
+    0x42: _implied(IncDXInstruction),
+    0x43: _implied(IncBXInstruction),
+    0x44: _implied(IncSPInstruction),
+    0x45: _implied(IncBPInstruction),
+    0x46: _implied(IncSIInstruction),
+    0x47: _implied(IncDIInstruction),
+    0x48: _implied(DecAXInstruction),
+    0x49: _implied(DecCXInstruction),
+    0x4a: _implied(DecDXInstruction),
+    0x4b: _implied(DecBXInstruction),
+    0x4c: _implied(DecSPInstruction),
+    0x4d: _implied(DecBPInstruction),
+    0x4e: _implied(DecSIInstruction),
+    0x4f: _implied(DecDIInstruction),
+    0x50: _implied(PushInstruction, 0),
+    0x51: _implied(PushInstruction, 1),
+    0x52: _implied(PushInstruction, 2),
+    0x53: _implied(PushInstruction, 3),
+    0x54: _implied(PushInstruction, 4),
+    0x55: _implied(PushInstruction, 5),
+    0x56: _implied(PushInstruction, 6),
+    0x57: _implied(PushInstruction, 7),
+    0x58: _implied(PopInstruction, 0),
+    0x59: _implied(PopInstruction, 1),
+    0x5a: _implied(PopInstruction, 2),
+    0x5b: _implied(PopInstruction, 3),
+    0x5c: _implied(PopInstruction, 4),
+    0x5d: _implied(PopInstruction, 5),
+    0x5e: _implied(PopInstruction, 6),
+    0x5f: _implied(PopInstruction, 7),
+    0x70: _operands(JoInstruction, 1),
+    0x71: _operands(JnoInstruction, 1),
+    0x72: _operands(JbInstruction, 1),
+    0x73: _operands(JnbInstruction, 1),
+    0x74: _operands(JzInstruction, 1),
+    0x75: _operands(JnzInstruction, 1),
+    0x76: _operands(JbeInstruction, 1),
+    0x77: _operands(JaInstruction, 1),
+    0x78: _operands(JsInstruction, 1),
+    0x79: _operands(JnsInstruction, 1),
+    0x7a: _operands(JpeInstruction, 1),
+    0x7b: _operands(JpoInstruction, 1),
+    0x7c: _operands(JlInstruction, 1),
+    0x7d: _operands(JgeInstruction, 1),
+    0x7e: _operands(JleInstruction, 1),
+    0x7f: _operands(JgInstruction, 1),
+    0x80: _operands(IntermediateInstruction, 0),
+    0x81: _operands(IntermediateInstruction, 0),
+    0x82: _operands(IntermediateInstruction, 0),
+    0x83: _operands(IntermediateInstruction, 0),
+    0x84: _operands(TestInstruction, 0),
+    0x85: _operands(TestInstruction, 0),
+    0x86: _operands(XchgInstruction, 0),
+    0x87: _operands(XchgInstruction, 0),
+    0x88: _operands(MovInstruction, 0),
+    0x89: _operands(MovInstruction, 0),
+    0x8a: _operands(MovInstruction, 0),
+    0x8b: _operands(MovInstruction, 0),
+    0x8c: _operands(MoveSegRegInstruction, 0),
+    0x8d: _operands(LoadEffectiveAddressInstruction, 0),
+    0x8e: _operands(MoveSegRegInstruction, 0),
+    0x90: _implied(NopInstruction),
+    0x91: _implied(XchgAxCxInstruction),
+    0x92: _implied(XchgAxDxInstruction),
+    0x93: _implied(XchgAxBxInstruction),
+    0x94: _implied(XchgAxSpInstruction),
+    0x95: _implied(XchgAxBpInstruction),
+    0x96: _implied(XchgAxSiInstruction),
+    0x97: _implied(XchgAxDiInstruction),
+    0x98: _implied(CbwInstruction),
+    0x99: _implied(CwdInstruction),
+    0x9a: _operands(CallInstruction, 1),
+    0x9c: _implied(PushfInstruction),
+    0x9d: _implied(PopfInstruction),
+    0xa0: _operands(MoveAlMem8Instruction, 1),
+    0xa1: _operands(MoveAxMem16Instruction, 1),
+    0xa2: _operands(MoveMem8AlInstruction, 1),
+    0xa3: _operands(MoveMem16AxInstruction, 1),
+    0xa4: _implied(MovsInstruction, word=False),
+    0xa6: _implied(CmpsInstruction, word=False),
+    0xaa: _implied(StosInstruction, word=False),
+    0xab: _implied(StosInstruction, word=True),
+    0xac: _implied(LodsInstruction, word=False),
+    0xad: _implied(LodsInstruction, word=True),
+    0xb0: _operands(MoveAlInstruction, 1),
+    0xb1: _operands(MoveCLInstruction, 1),
+    0xb2: _operands(MoveDLInstruction, 1),
+    0xb3: _operands(MoveBLInstruction, 1),
+    0xb4: _operands(MoveAhInstruction, 1),
+    0xb5: _operands(MoveChInstruction, 1),
+    0xb6: _operands(MoveDhInstruction, 1),
+    0xb7: _operands(MoveBhInstruction, 1),
+    0xb8: _operands(MoveAXInstruction, 1),
+    0xb9: _operands(MoveCXInstruction, 1),
+    0xba: _operands(MoveDXInstruction, 1),
+    0xbb: _operands(MoveBXInstruction, 1),
+    0xbc: _operands(MoveSPInstruction, 1),
+    0xbd: _operands(MoveBPInstruction, 1),
+    0xbe: _operands(MoveSIInstruction, 1),
+    0xbf: _operands(MoveDIInstruction, 1),
+    0xc3: _implied(ReturnIntraInstruction),
+    0xc4: _operands(LesInstruction, 0),
+    0xc5: _operands(LdsInstruction, 0),
+    0xc6: _operands(MovMem8Imm8Instruction, 0),
+    0xc7: _operands(MovMem16Imm16Instruction, 0),
+    0xca: _operands(ReturnImm16Instruction, 1),
+    0xcb: _implied(ReturnInstruction),
+    0xcd: _operands(InterruptInstruction, 1),
+    0xd0: _operands(ShiftInstruction, 0),
+    0xd1: _operands(ShiftInstruction, 0),
+    0xd2: _operands(ShiftInstruction, 0),
+    0xd3: _operands(ShiftInstruction, 0),
+    0xe2: _operands(LoopInstruction, 1),
+    0xe3: _operands(JcxzInstruction, 1),
+    0xe8: _operands(CallNearInstruction, 1),
+    0xe9: _operands(JumpNearInstruction, 1),
+    0xea: _operands(JumpLongInstruction, 1),
+    0xeb: _operands(JumpShortInstruction, 1),
+    0xee: _implied(OutAlDxInstruction),
+    0xf3: _prefix(RepInstruction),
+    0xf5: _implied(CMCInstruction),
+    0xf6: _operands(Grp1Instruction, 0),
+    0xf7: _operands(Grp1Instruction, 0),
+    0xf8: _implied(CLCInstruction),
+    0xf9: _implied(STCInstruction),
+    0xfa: _implied(CLIInstruction),
+    0xfb: _implied(STIInstruction),
+    0xfc: _implied(CLDInstruction),
+    0xfd: _implied(STDInstruction),
+    0xfe: _operands(Grp2Instruction, 0),
+    0xff: _operands(Grp2Instruction, 0),
+}
+
+DECODERS = tuple(OPCODES.get(code, _unimplemented) for code in range(256))
@@ -0,0 +1,118 @@
+import struct
+
+from address import Address
+from instructions import *
+
+
+SLICE_LIMIT = 8
+MAX_ENTRIES = 256
+
+# Index register of the [bx+disp16], [si+disp16] and [di+disp16] forms, by rm
+TABLE_INDEXES = {7: 3, 4: 6, 5: 7}
+
+EXCHANGES = (XchgAxCxInstruction, XchgAxDxInstruction, XchgAxBxInstruction, XchgAxSpInstruction, XchgAxBpInstruction,
+             XchgAxSiInstruction, XchgAxDiInstruction)
+
+
+def overlaps(operand, register):
+    if isinstance(operand, ModReg) and operand.template is None:
+        operand = Register.get(operand.rm, operand.word)
+    if not isinstance(operand, Register):
+        return False
+    if operand.word:
+        return operand.register == register
+    return register < 4 and operand.register in (register, register + 4)
+
+
+def writes(instruction, register):
+    operands = [getattr(instruction, 'destination', None), getattr(instruction, 'dest', None),
+                getattr(instruction, 'register', None)]
+    if isinstance(instruction, RegToRegMemBaseInstruction):
+        operands.append(Register.get(instruction.modreg.reg, instruction.word))
+    if isinstance(instruction, EXCHANGES):
+        operands.append(instruction.source)
+    return any(overlaps(operand, register) for operand in operands)
+
+
+def is_register(operand, register):
+    return isinstance(operand, ModReg) and operand.template is None and operand.word and operand.rm == register
+
+
+def is_scale(instruction, register):
+    if isinstance(instruction, ShiftInstruction):
+        return instruction.modreg.reg == 4 and not instruction.direction and is_register(instruction.modreg, register)
+    elif isinstance(instruction, AddInstruction):
+        return instruction.word and instruction.modreg.reg == register and is_register(instruction.modreg, register)
+    return False
+
+
+def compared(instruction, register):
+    if isinstance(instruction, IntermediateInstruction) and instruction.modreg.reg == 7:
+        if is_register(instruction.modreg, register):
+            return instruction.source.immediate16 if instruction.src_word else instruction.source.immediate8
+    return None
+
+
+def guard_entries(guard, taken, bound):
+    if isinstance(guard, JaInstruction):
+        return bound + 1 if not taken else None
+    elif isinstance(guard, JbeInstruction):
+        return bound + 1 if taken else None
+    elif isinstance(guard, JnbInstruction):
+        return bound if not taken else None
+    elif isinstance(guard, JbInstruction):
+        return bound if taken else None
+    return None
+
+
+class JumpTableResolver(object):
+    def __init__(self, program):
+        self.program = program
+        self.predecessors = {}
+
+    def link(self, address, successor):
+        self.predecessors.setdefault(successor.linear, address)
+
+    def resolve(self, instruction, address):
+        if not isinstance(instruction, CSSegmentOverride) or not isinstance(instruction.instruction,
+                                                                           JumpIndirectInstruction):
+            return []
+        jump = instruction.instruction
+        if isinstance(jump, JumpFarIndirectInstruction) or jump.modreg.mod != 2:
+            return []
+        register = TABLE_INDEXES.get(jump.modreg.rm)
+        if register is None:
+            return []
+        entries = self.__slice(address, register)
+        if not entries or entries > MAX_ENTRIES:
+            return []
+        table = address.segment * 16 + (jump.modreg.displacement & 0xffff)
+        if table + entries * 2 > len(self.program.space):
+            return []
+        return [Address(address.segment, offset)
+                for offset in struct.unpack('<%dH' % entries, self.program.space[table:table + entries * 2])]
+
+    def __slice(self, address, register):
+        scaled = False
+        for _ in range(SLICE_LIMIT):
+            previous = self.predecessors.get(address.linear)
+            if previous is None:
+                return None
+            instruction = self.program.cache.decode(previous.linear)
+            if not scaled:
+                scaled = is_scale(instruction, register)
+                if not scaled and writes(instruction, register):
+                    return None
+            elif isinstance(instruction, (JaInstruction, JbeInstruction, JnbInstruction, JbInstruction)):
+                taken = address.linear != (previous + len(instruction)).linear
+                guard = self.predecessors.get(previous.linear)
+                if guard is None:
+                    return None
+                bound = compared(self.program.cache.decode(guard.linear), register)
+                if bound is None:
+                    return None
+                return guard_entries(instruction, taken, bound)
+            elif writes(instruction, register):
+                return None
+            address = previous
+        return None
@@ -0,0 +1,108 @@
+from flow import FALLTHROUGH, JUMP, BRANCH, CALL, RETURN
+from instructions import MODRM
+
+
+INVALID = 0
+FIXED = 1
+MODRM_FORM = 2
+SEGMENT_FORM = 3
+PREFIX = 4
+GROUP1 = 5
+GROUP2 = 6
+
+MODRM_LENGTHS = bytes(entry[4] for entry in MODRM)
+
+
+def _table(entries, default):
+    table = bytearray([default]) * 256
+    for codes, value in entries:
+        for code in codes:
+            table[code] = value
+    return bytes(table)
+
+
+def _codes(*ranges):
+    return [code for first, last in ranges for code in range(first, last + 1)]
+
+
+# Instruction form of every opcode, matching what Instruction.decode accepts
+FORMS = _table([
+    (_codes((0x00, 0x0e), (0x10, 0x25), (0x27, 0x2d), (0x30, 0x33), (0x3a, 0x3d), (0x40, 0x5f), (0x70, 0x7f),
+            (0x90, 0x9a), (0x9c, 0x9d), (0xa0, 0xa4), (0xb0, 0xbf), (0xca, 0xcb), (0xd0, 0xd3), (0xe2, 0xe3),
+            (0xe8, 0xeb), (0xf8, 0xfd)) + [0xa6, 0xaa, 0xab, 0xac, 0xad, 0xc3, 0xcd, 0xee, 0xf5], FIXED),
+    (_codes((0x00, 0x03), (0x08, 0x0b), (0x10, 0x13), (0x18, 0x1b), (0x20, 0x23), (0x28, 0x2b), (0x30, 0x33),
+            (0x3a, 0x3b), (0x80, 0x8b), (0xc4, 0xc7)) + [0x8d], MODRM_FORM),
+    ([0x8c, 0x8e], SEGMENT_FORM),
+    ([0x26, 0x2e, 0x36, 0x3e, 0xf3], PREFIX),
+    ([0xf6, 0xf7], GROUP1),
+    ([0xfe, 0xff], GROUP2),
+], INVALID)
+
+# Total length for FIXED opcodes, immediate bytes following the ModR/M operand for MODRM_FORM opcodes
+SIZES = _table([
+    (_codes((0x06, 0x07), (0x16, 0x17), (0x1e, 0x1f), (0x40, 0x5f), (0x90, 0x99), (0x9c, 0x9d), (0xf8, 0xfd))
+     + [0x0e, 0x27, 0xa4, 0xa6, 0xaa, 0xab, 0xac, 0xad, 0xc3, 0xcb, 0xee, 0xf5], 1),
+    ([0x80, 0x82, 0x83, 0xc6], 1),
+    (_codes((0x70, 0x7f), (0xb0, 0xb7), (0xd0, 0xd3), (0xe2, 0xe3))
+     + [0x04, 0x0c, 0x14, 0x1c, 0x24, 0x2c, 0x3c, 0xcd, 0xeb], 2),
+    ([0x81, 0xc7], 2),
+    (_codes((0xa0, 0xa3), (0xb8, 0xbf)) + [0x05, 0x0d, 0x15, 0x1d, 0x25, 0x2d, 0x3d, 0xca, 0xe8, 0xe9], 3),
+    ([0x9a, 0xea], 5),
+], 0)
+
+FLOWS = _table([
+    (_codes((0x70, 0x7f), (0xe2, 0xe3)), BRANCH),
+    ([0xe9, 0xea, 0xeb], JUMP),
+    ([0x9a, 0xe8], CALL),
+    ([0xc3, 0xca, 0xcb], RETURN),
+], FALLTHROUGH)
+
+# Grp1 (f6/f7) and Grp2 (fe/ff) by the reg field of the ModR/M byte
+GROUP1_VALID = (True, False, True, True, True, True, True, True)
+GROUP2_VALID = (True, True, False, True, True, True, True, False)
+GROUP2_BYTE_VALID = (True, True, False, False, False, False, False, False)
+GROUP2_FLOWS = (FALLTHROUGH, FALLTHROUGH, FALLTHROUGH, CALL, JUMP, JUMP, FALLTHROUGH, FALLTHROUGH)
+
+
+def instruction_length(program, offset):
+    length = 0
+    code = program[offset]
+    form = FORMS[code]
+    while form == PREFIX:
+        length += 1
+        offset += 1
+        code = program[offset]
+        form = FORMS[code]
+    if form == FIXED:
+        return length + SIZES[code]
+    elif form == MODRM_FORM:
+        return length + 1 + MODRM_LENGTHS[program[offset + 1]] + SIZES[code]
+    modrm = program[offset + 1]
+    reg = (modrm & 0x38) >> 3
+    if form == SEGMENT_FORM:
+        if reg > 3:
+            return 0
+        return length + 1 + MODRM_LENGTHS[modrm]
+    elif form == GROUP1:
+        if not GROUP1_VALID[reg]:
+            return 0
+        elif reg == 0:
+            return length + 1 + MODRM_LENGTHS[modrm] + 1 + (code & 0x01)
+        return length + 1 + MODRM_LENGTHS[modrm]
+    elif form == GROUP2:
+        if not (GROUP2_VALID if code & 0x01 else GROUP2_BYTE_VALID)[reg]:
+            return 0
+        elif reg == 3:
+            return length + 4
+        return length + 1 + MODRM_LENGTHS[modrm]
+    return 0
+
+
+def instruction_flow(program, offset):
+    code = program[offset]
+    while FORMS[code] == PREFIX:
+        offset += 1
+        code = program[offset]
+    if code == 0xff:
+        return GROUP2_FLOWS[(program[offset + 1] & 0x38) >> 3]
+    return FLOWS[code]
@@ -0,0 +1,16 @@
+from flow import CALL, branch_target, flow_class
+
+
+def format_instruction(instruction, stubs=None):
+    line = "%s %s" % (instruction.address, instruction)
+    if stubs and flow_class(instruction) == CALL:
+        target = branch_target(instruction, instruction.address)
+        unit = None if target is None else stubs.unit(target)
+        if unit is not None:
+            line += " ; unit %d %s" % (unit, stubs.resolve(target))
+    return line
+
+
+def print_listing(instructions, stubs=None):
+    for instruction in instructions:
+        print(format_instruction(instruction, stubs))
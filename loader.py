@@ -1,7 +1,18 @@
 import io
+import mmap
 
 from address import Address
+from address_space import AddressSpace
+from callgraph import CallGraph
+from coverage_map import CoverageMap
+from decode_cache import DecodeCache
+from decoded_program import DecodedProgram
+from flow import JUMP, CALL, RETURN, branch_target, flow_class, track_ah, terminates
+from policy import TraversalPolicy
 from instructions import *
+from jump_table import JumpTableResolver
+from mapping import map_file, read_view
+from overlay import StubIndex
 
 
 class HeaderFactory:
@@ -38,66 +49,176 @@ class HeaderFactory:
 
 
 class ProgramIterator(object):
-    def __init__(self, program, address):
+    def __init__(self, program, address, policy=None, budget=None):
         self.program = program
-        self.addresses = [address]
-        self.visited = [address]
+        self.budget = budget if budget is not None else (policy or TraversalPolicy()).budget()
+        self.stopped = None
+        self.addresses = [(address, None)]
+        self.visited = set()
+        self.undecodable = set()
+        self.stops = []
+        self.segments = set()
+        self.coverage = CoverageMap(len(program.space))
+        self.jump_tables = JumpTableResolver(program)
+
+    def __iter__(self):
+        return self
 
     def __next__(self):
-        address = self.addresses.pop()
-        if address == Address(0x0000, 0x0156):
-            raise StopIteration
-        instruction = Instruction.decode(self.program, address.segment * 16 + address.offset)
+        while True:
+            address, ah = self.__next_address()
+            if self.budget.is_stop(address):
+                self.stops.append(address)
+                self.visited.add(address.linear)
+                continue
+            self.stopped = self.budget.exhausted()
+            if self.stopped:
+                raise StopIteration
+            try:
+                instruction = self.program.cache.decode(address.linear)
+                break
+            except Exception:
+                self.undecodable.add(address.linear)
+                self.visited.add(address.linear)
+        self.budget.charge(len(instruction))
         instruction.address = address
-        self.visited.append(address)
-
-        if not (isinstance(instruction, ReturnImm16Instruction) or
-                isinstance(instruction, ReturnInstruction) or
-                isinstance(instruction, ReturnIntraInstruction) or
-                isinstance(instruction, JumpLongInstruction) or
-                isinstance(instruction, JumpShortInstruction)):
-            next_address = address + len(instruction)
-            self.addresses.append(next_address)
-
-        if isinstance(instruction, CallInstruction):
-            address = Address(instruction.segment_address, instruction.offset)
-        elif isinstance(instruction, Grp2CallNearInstruction):
-            address = None
-        elif isinstance(instruction, JumpLongInstruction):
-            address = Address(instruction.segment, instruction.offset)
-        elif (isinstance(instruction, CallNearInstruction) or
-              isinstance(instruction, JumpNearInstruction) or
-              isinstance(instruction, JumpShortInstruction)):
-            address += len(instruction) + instruction.offset
+        self.visited.add(address.linear)
+        self.segments.add(address.segment)
+        self.coverage.mark(address.linear, len(instruction))
+
+        target = branch_target(instruction, address)
+        flow = flow_class(instruction)
+        if flow == CALL:
+            if target is not None:
+                target = self.program.resolve_call(target)
+            returns = target is None or target.linear not in self.program.no_return
         else:
-            address = None
-        if address and address not in self.visited:
-            self.addresses.append(address)
+            returns = flow not in (JUMP, RETURN) and not terminates(instruction, ah)
+        ah = track_ah(instruction, ah)
+        if returns:
+            self.__queue(address, address + len(instruction), ah)
+
+        if target:
+            self.__queue(address, target, ah)
+        elif flow == JUMP:
+            for target in self.jump_tables.resolve(instruction, address):
+                self.__queue(address, target, ah)
 
         return instruction
 
+    def segment_coverage(self):
+        return self.coverage.segment_coverage(self.segments)
+
+    def unit_coverage(self):
+        return [self.coverage.coverage(start, end) for (start, end) in self.program.units]
+
+    def __queue(self, address, successor, ah):
+        if successor.linear not in self.visited:
+            self.jump_tables.link(address, successor)
+            self.addresses.append((successor, ah))
+
+    def __next_address(self):
+        while self.addresses:
+            address, ah = self.addresses.pop()
+            if address.linear not in self.visited:
+                return address, ah
+        raise StopIteration
+
 
 class Program(object):
     def __init__(self, exe, size, address):
         self.size = size
-        self.program = bytearray(exe.read(size))
+        self.space = AddressSpace()
+        if isinstance(exe, mmap.mmap):
+            self.space.map(0, read_view(exe, exe.tell(), size))
+        else:
+            self.space.map(0, bytearray(exe.read(size)))
         self.address = address
+        self.cache = DecodeCache(self.space)
+        self.units = []
+        self.policy = TraversalPolicy()
+        self.no_return = set()
+        self.deferred = {}
+        self.stubs = StubIndex()
+
+    @property
+    def program(self):
+        return self.space.view()
 
     def __iter__(self):
-        return ProgramIterator(self.program, self.address)
+        return self.traverse()
+
+    def traverse(self, budget=None):
+        return ProgramIterator(self, self.address, self.policy, budget)
+
+    def find_no_return(self, budget=None):
+        self.no_return = CallGraph(self, policy=self.policy, budget=budget).explore([self.address]).no_return()
+        return self.no_return
+
+    def decode(self):
+        return DecodedProgram.collect(self.program, self, self.stubs)
 
     def append_unit(self, unit):
-        adjustment = (16 - (len(self.program) & 0xf)) % 16
-        if adjustment:
-            self.program += bytes(adjustment)
-        unit_address = Address(len(self.program) >> 4, len(self.program) & 0xf)
-        self.program += unit.code
+        end = len(self.space)
+        start = self.space.append(unit.code)
+        unit_address = Address(start >> 4, start & 0xf)
+        self.units.append((start, len(self.space)))
+        self.cache.invalidate(end, len(self.space))
         return unit_address
 
+    def place_units(self, image, units, slots):
+        end = len(self.space)
+        image[:end] = self.space.view()
+        self.space = AddressSpace()
+        self.space.map(0, image)
+        self.cache.program = self.space
+        addresses = self.reserve_units(units, slots)
+        self.cache.invalidate(end, len(self.space))
+        return addresses
+
+    def reserve_units(self, units, slots):
+        addresses = []
+        for unit, slot in zip(units, slots):
+            self.units.append((slot, slot + unit.code_size))
+            addresses.append(Address(slot >> 4, slot & 0xf))
+        return addresses
+
+    def map_unit(self, start, code):
+        self.space.map(start, code)
+        self.cache.invalidate(start, start + len(code))
+
+    def write(self, offset, data):
+        self.space.write(offset, data)
+        self.invalidate(offset, offset + len(data))
+
+    def invalidate(self, start, end):
+        self.cache.invalidate(start, end)
+
+    def defer_unit(self, entries, load):
+        for entry in entries:
+            self.deferred[entry] = (entries, load)
+            self.cache.invalidate(entry, entry + 5)
+        self.cache.fault = self.__fault
+
+    def resolve_call(self, target):
+        self.__fault(target.linear)
+        return self.stubs.resolve(target)
+
+    def load_units(self):
+        while self.deferred:
+            self.__fault(next(iter(self.deferred)))
+
+    def __fault(self, linear):
+        if linear in self.deferred:
+            (entries, load) = self.deferred[linear]
+            for entry in entries:
+                del self.deferred[entry]
+            load()
+
 
 class Loader:
-    def __init__(self, filename):
-        self.exe = io.open(filename, 'rb')
+    def __init__(self, filename, mapped=False):
+        self.exe = map_file(filename) if mapped else io.open(filename, 'rb')
         self.header = None
         self.program = None
         self.header_size = 0
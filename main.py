@@ -1,16 +1,50 @@
+import argparse
+
+from address import Address
+from callgraph import CallGraph
+from listing import print_listing
 from loader import Loader
 from overlay import Overlay
+from policy import TraversalPolicy
 from relocator import Relocator
 
 if __name__ == "__main__":
-    loader = Loader("start.exe")
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--linear-sweep', action='store_true',
+                        help='disassemble by linear sweep from the entry point instead of following control flow')
+    parser.add_argument('--max-instructions', type=int, help='stop after decoding this many instructions')
+    parser.add_argument('--max-bytes', type=int, help='stop after decoding this many bytes')
+    parser.add_argument('--deadline', type=float, help='stop after this many seconds of traversal')
+    parser.add_argument('--mmap', action='store_true',
+                        help='map start.exe and game.ovr copy-on-write instead of reading them into memory')
+    parser.add_argument('--lazy-overlays', action='store_true',
+                        help='read and link each overlay unit only when traversal first reaches one of its entries')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='decode procedures across this many worker processes, listing them in address order')
+    args = parser.parse_args()
+
+    loader = Loader("start.exe", args.mmap)
     loader.fetch_header()
     relocator = Relocator(loader)
     program = loader.load_program()
-    overlay = Overlay("game.ovr", program)
-    overlay.overlay_code()
+    program.policy = TraversalPolicy(stop_addresses=[Address(0x0000, 0x0156)], max_instructions=args.max_instructions,
+                                     max_bytes=args.max_bytes, deadline=args.deadline)
+    overlay = Overlay("game.ovr", program, args.mmap)
+    overlay.overlay_code(args.lazy_overlays)
     header = loader.header
     print(header)
 
-    for instruction in program:
-        print("%s %s" % (instruction.address, instruction))
+    if args.linear_sweep:
+        from sweep import LinearSweep
+        program.load_units()
+        print_listing(LinearSweep(program.program, [program.address]), program.stubs)
+    elif args.jobs > 1:
+        from parallel import ProcedurePool
+        with ProcedurePool(program, args.jobs, program.policy) as pool:
+            graph = CallGraph(program, policy=program.policy, pool=pool).explore([program.address])
+            for line in pool.listing(graph):
+                print(line)
+    else:
+        budget = program.policy.budget()
+        program.find_no_return(budget)
+        print_listing(program.traverse(budget), program.stubs)
@@ -0,0 +1,24 @@
+import io
+import mmap
+import sys
+from array import array
+
+
+def map_file(filename):
+    with io.open(filename, 'rb') as file:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+
+
+def read_view(source, offset, size):
+    if isinstance(source, mmap.mmap):
+        return memoryview(source)[offset:offset + size]
+    source.seek(offset)
+    return source.read(size)
+
+
+def read_words(source, offset, count):
+    words = array('H')
+    words.frombytes(read_view(source, offset, count * 2))
+    if sys.byteorder == 'big':
+        words.byteswap()
+    return words
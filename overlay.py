@@ -1,36 +1,67 @@
+import functools
 import io
+import mmap
+import re
 
 import struct
 
 from address import Address
+from mapping import map_file, read_view, read_words
 
 
-def is_unit_stub(program, offset):
-    return program[offset] == 0xcd and \
-        program[offset + 1] == 0x3f and \
-        program[offset + 2] == 0x00 and \
-        program[offset + 3] == 0x00
+UNIT_STUB = b'\xcd\x3f\x00\x00'
+UNIT_STUB_PATTERN = re.compile(re.escape(UNIT_STUB))
+
+
+class StubIndex(object):
+    __slots__ = ('entries',)
+
+    def __init__(self):
+        self.entries = {}
+
+    def add(self, entry, unit, target):
+        self.entries[entry] = (unit, target)
+
+    def resolve(self, address):
+        entry = self.entries.get(address.linear)
+        return address if entry is None else entry[1]
+
+    def unit(self, address):
+        entry = self.entries.get(address.linear)
+        return None if entry is None else entry[0]
+
+    def __contains__(self, linear):
+        return linear in self.entries
+
+    def __len__(self):
+        return len(self.entries)
 
 
 class Unit(object):
-    def __init__(self, program, offset, overlay):
+    def __init__(self, program, offset):
         self.program = program
         self.offset = Address(offset >> 4, offset & 0xf)
         (_, _, self.file_offset, self.code_size, self.relocation_size, self.entries) = \
             struct.unpack('<HHIHHH', self.program[offset:offset + 14])
-        self.__extract_code(overlay)
-        self.__extract_fixup_table(overlay)
+        self.code = None
+        self.fixup_table = None
 
-    def __extract_code(self, overlay):
-        overlay.seek(self.file_offset)
-        self.code = overlay.read(self.code_size)
+    def entry_offsets(self):
+        return [self.offset.segment * 16 + i * 5 + 32 for i in range(self.entries)]
 
-    def __extract_fixup_table(self, overlay):
-        overlay.seek(self.file_offset + self.code_size)
-        self.fixup_table = []
-        for x in range(0, self.relocation_size // 2):
-            (offset,) = struct.unpack("<H", overlay.read(2))
-            self.fixup_table.append(offset)
+    def extract_code(self, overlay, slot=None):
+        if slot is None:
+            self.code = read_view(overlay, self.file_offset, self.code_size)
+        elif isinstance(overlay, mmap.mmap):
+            slot[:] = read_view(overlay, self.file_offset, self.code_size)
+            self.code = slot
+        else:
+            overlay.seek(self.file_offset)
+            overlay.readinto(slot)
+            self.code = slot
+
+    def extract_fixup_table(self, overlay):
+        self.fixup_table = read_words(overlay, self.file_offset + self.code_size, self.relocation_size // 2)
 
     def fixup(self, address):
         for fixup in self.fixup_table:
@@ -47,33 +78,91 @@ class Unit(object):
 
 
 class Overlay(object):
-    def __init__(self, filename, program):
+    def __init__(self, filename, program, mapped=False):
         self.program = program
-        self.overlay = io.open(filename, 'rb')
+        self.overlay = map_file(filename) if mapped else io.open(filename, 'rb')
 
-    def overlay_code(self):
+    def overlay_code(self, lazy=False):
         units = self.__extract_units()
+        addresses = self.__defer_units(units) if lazy else self.__place_units(units)
+        self.__index_stubs(units, addresses)
+        if not lazy:
+            for unit, unit_address in zip(units, addresses):
+                self.__link_unit(unit, unit_address)
+
+    def __index_stubs(self, units, addresses):
+        for number, (unit, unit_address) in enumerate(zip(units, addresses)):
+            for entry in unit.entry_offsets():
+                (_, offset) = struct.unpack('<HH', self.program.space[entry:entry + 4])
+                self.program.stubs.add(entry, number, Address(unit_address.segment, offset))
+
+    def __link_unit(self, unit, unit_address):
+        unit.extract_fixup_table(self.overlay)
+        print(unit)
+        unit.fixup(unit_address)
+        self.fix_jumps(unit, unit_address.segment)
+
+    def __defer_units(self, units):
+        if not units:
+            return []
+        slots, end = self.__layout(units)
+        if isinstance(self.overlay, mmap.mmap):
+            image = None
+            addresses = self.program.reserve_units(units, slots)
+        else:
+            image = memoryview(bytearray(end))
+            addresses = self.program.place_units(image, units, slots)
+        for unit, slot, unit_address in zip(units, slots, addresses):
+            self.program.defer_unit(unit.entry_offsets(),
+                                    functools.partial(self.__load_unit, unit, image, slot, unit_address))
+        return addresses
+
+    def __load_unit(self, unit, image, slot, unit_address):
+        if image is None:
+            unit.extract_code(self.overlay)
+            self.program.map_unit(slot, unit.code)
+        else:
+            unit.extract_code(self.overlay, image[slot:slot + unit.code_size])
+            self.program.invalidate(slot, slot + unit.code_size)
+        self.__link_unit(unit, unit_address)
+
+    def __layout(self, units):
+        end = len(self.program.space)
+        slots = []
         for unit in units:
-            print(unit)
-            unit_address = self.program.append_unit(unit)
-            unit.fixup(unit_address)
-            self.fix_jumps(unit, unit_address.segment)
+            end += (16 - end % 16) % 16
+            slots.append(end)
+            end += unit.code_size
+        return slots, end
+
+    def __place_units(self, units):
+        if not units:
+            return []
+        if isinstance(self.overlay, mmap.mmap):
+            for unit in units:
+                unit.extract_code(self.overlay)
+            return [self.program.append_unit(unit) for unit in units]
+        slots, end = self.__layout(units)
+        image = memoryview(bytearray(end))
+        for unit, slot in zip(units, slots):
+            unit.extract_code(self.overlay, image[slot:slot + unit.code_size])
+        return self.program.place_units(image, units, slots)
 
     def __extract_units(self):
         program = self.program.program
         units = []
         offset = 0
-        while offset < self.program.size:
-            if is_unit_stub(program, offset):
-                unit = Unit(program, offset, self.overlay)
-                units.append(unit)
-                offset += 32 + unit.entries * 5
-            else:
-                offset += 1
+        end = min(len(program), self.program.size + len(UNIT_STUB) - 1)
+        while True:
+            match = UNIT_STUB_PATTERN.search(program, offset, end)
+            if match is None:
+                break
+            unit = Unit(program, match.start())
+            units.append(unit)
+            offset = match.start() + 32 + unit.entries * 5
         return units
 
     def fix_jumps(self, unit, segment):
-        for i in range(unit.entries):
-            program_offset = unit.offset.segment * 16 + i * 5 + 32
-            (_, offset) = struct.unpack('<HH', self.program.program[program_offset:program_offset+4])
-            self.program.program[program_offset:program_offset+5] = struct.pack('<BHH', 0xEA, offset, segment)
+        for program_offset in unit.entry_offsets():
+            (_, offset) = struct.unpack('<HH', self.program.space[program_offset:program_offset+4])
+            self.program.write(program_offset, struct.pack('<BHH', 0xEA, offset, segment))
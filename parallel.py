@@ -0,0 +1,99 @@
+import multiprocessing
+from multiprocessing import shared_memory
+
+from address import Address
+from callgraph import explore_procedure
+from decode_cache import DecodeCache
+from jump_table import JumpTableResolver
+from listing import format_instruction
+from policy import TraversalPolicy
+
+
+class SharedProgram(object):
+    def __init__(self, image, size, no_return, stubs):
+        self.stubs = stubs
+        self.image = shared_memory.SharedMemory(name=image)
+        self.flags = shared_memory.SharedMemory(name=no_return)
+        self.program = self.image.buf[:size]
+        self.space = self.program
+        self.no_return = self.flags.buf
+        self.cache = DecodeCache(self.program)
+
+    def resolve_call(self, target):
+        return self.stubs.resolve(target)
+
+
+_shared = None
+_policy = None
+
+
+def _attach(image, size, no_return, stubs, policy):
+    global _shared, _policy
+    _shared = SharedProgram(image, size, no_return, stubs)
+    _policy = policy
+
+
+def _explore(procedure):
+    budget = _policy.budget()
+    no_return = _shared.no_return
+    explore_procedure(_shared, procedure, JumpTableResolver(_shared), budget,
+                      lambda linear: linear >= len(no_return) or not no_return[linear])
+    return procedure, budget
+
+
+def _format(chunk):
+    lines = []
+    for (segment, linear) in chunk:
+        instruction = _shared.cache.decode(linear)
+        instruction.address = Address(segment, (linear - segment * 16) & 0xffff)
+        lines.append(format_instruction(instruction, _shared.stubs))
+    return lines
+
+
+class ProcedurePool(object):
+    def __init__(self, program, jobs, policy=None):
+        program.load_units()
+        size = len(program.program)
+        self.jobs = jobs
+        self.size = size
+        self.image = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        self.image.buf[:size] = program.program
+        self.flags = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        self.flags.buf[:size] = bytes(size)
+        self.flagged = set()
+        self.pool = multiprocessing.Pool(jobs, _attach,
+                                         (self.image.name, size, self.flags.name, program.stubs,
+                                          (policy or TraversalPolicy()).procedure_policy()))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+        for memory in (self.image, self.flags):
+            memory.close()
+            memory.unlink()
+
+    def no_return(self, linears):
+        for linear in linears:
+            if linear < self.size and linear not in self.flagged:
+                self.flagged.add(linear)
+                self.flags.buf[linear] = 1
+
+    def explore(self, procedures):
+        chunk = max(1, len(procedures) // (self.jobs * 4))
+        return self.pool.map(_explore, [procedure.task() for procedure in procedures], chunk)
+
+    def listing(self, graph):
+        segments = {}
+        for procedure in sorted(graph, key=lambda procedure: procedure.entry.linear):
+            for linear in procedure.instructions:
+                segments.setdefault(linear, procedure.entry.segment)
+        instructions = [(segments[linear], linear) for linear in sorted(segments)]
+        size = max(1, -(-len(instructions) // (self.jobs * 4)))
+        chunks = [instructions[start:start + size] for start in range(0, len(instructions), size)]
+        return [line for lines in self.pool.map(_format, chunks) for line in lines]
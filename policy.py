@@ -0,0 +1,57 @@
+import time
+
+
+INSTRUCTION_LIMIT = 'instruction limit'
+BYTE_LIMIT = 'byte limit'
+DEADLINE = 'deadline'
+PROCEDURE_LIMIT = 'procedure limit'
+
+
+class TraversalPolicy(object):
+    def __init__(self, stop_addresses=(), max_instructions=None, max_bytes=None, deadline=None,
+                 max_procedure_instructions=None):
+        self.stop_addresses = set(address.linear for address in stop_addresses)
+        self.max_instructions = max_instructions
+        self.max_bytes = max_bytes
+        self.deadline = deadline
+        self.max_procedure_instructions = max_procedure_instructions
+
+    def budget(self):
+        return TraversalBudget(self)
+
+    def procedure_policy(self):
+        policy = TraversalPolicy(max_procedure_instructions=self.max_procedure_instructions)
+        policy.stop_addresses = self.stop_addresses
+        return policy
+
+
+class TraversalBudget(object):
+    def __init__(self, policy):
+        self.policy = policy
+        self.instructions = 0
+        self.bytes = 0
+        self.deadline = time.monotonic() + policy.deadline if policy.deadline is not None else None
+
+    def exhausted(self):
+        if self.policy.max_instructions is not None and self.instructions >= self.policy.max_instructions:
+            return INSTRUCTION_LIMIT
+        elif self.policy.max_bytes is not None and self.bytes >= self.policy.max_bytes:
+            return BYTE_LIMIT
+        elif self.deadline is not None and time.monotonic() >= self.deadline:
+            return DEADLINE
+        return None
+
+    def is_stop(self, address):
+        return address.linear in self.policy.stop_addresses
+
+    def procedure_exhausted(self, instructions):
+        limit = self.policy.max_procedure_instructions
+        return limit is not None and instructions >= limit
+
+    def charge(self, length):
+        self.instructions += 1
+        self.bytes += length
+
+    def merge(self, other):
+        self.instructions += other.instructions
+        self.bytes += other.bytes
@@ -1,4 +1,4 @@
-import struct
+from mapping import read_words
 
 
 class Relocator(object):
@@ -7,17 +7,15 @@ class Relocator(object):
         self.exe = loader.exe
 
     def __create_relocation_table(self):
-        self.exe.seek(self.header.reloc_table_offset)
-        self.reloc_table = []
-        for x in range(0, self.header.num_relocs):
-            (offset, segment) = struct.unpack("<HH", self.exe.read(4))
-            self.reloc_table.append((offset, segment))
+        self.reloc_table = read_words(self.exe, self.header.reloc_table_offset, self.header.num_relocs * 2)
+        self.reloc_offsets = self.reloc_table[0::2]
+        self.reloc_segments = self.reloc_table[1::2]
 
     def __str__(self):
         self.__create_relocation_table()
         str = ''
         for x in range(0, self.header.num_relocs):
             str += "Reloc %u\n" % (int(x) + 1)
-            str += "offset: %04x\n" % self.reloc_table[x][0]
-            str += "segment: %04x\n" % self.reloc_table[x][1]
+            str += "offset: %04x\n" % self.reloc_offsets[x]
+            str += "segment: %04x\n" % self.reloc_segments[x]
         return str
@@ -0,0 +1,78 @@
+import numpy
+
+from address import Address
+from instructions import Instruction
+from length_decoder import FORMS, SIZES, MODRM_LENGTHS, FIXED, MODRM_FORM, SEGMENT_FORM, PREFIX, GROUP1, GROUP2, \
+    GROUP1_VALID, GROUP2_VALID, GROUP2_BYTE_VALID
+
+
+FORMS_ARRAY = numpy.frombuffer(FORMS, dtype=numpy.uint8)
+SIZES_ARRAY = numpy.frombuffer(SIZES, dtype=numpy.uint8).astype(numpy.int32)
+MODRM_LENGTHS_ARRAY = numpy.frombuffer(MODRM_LENGTHS, dtype=numpy.uint8).astype(numpy.int32)
+GROUP1_VALID_ARRAY = numpy.array(GROUP1_VALID)
+GROUP2_VALID_ARRAY = numpy.array(GROUP2_VALID)
+GROUP2_BYTE_VALID_ARRAY = numpy.array(GROUP2_BYTE_VALID)
+
+
+def length_table(program):
+    codes = numpy.frombuffer(program, dtype=numpy.uint8)
+    modrm = numpy.zeros_like(codes)
+    modrm[:-1] = codes[1:]
+    form = FORMS_ARRAY[codes]
+    reg = (modrm >> 3) & 0x07
+    with_modrm = 1 + MODRM_LENGTHS_ARRAY[modrm]
+
+    lengths = numpy.zeros(len(codes), dtype=numpy.int32)
+    lengths = numpy.where(form == FIXED, SIZES_ARRAY[codes], lengths)
+    lengths = numpy.where(form == MODRM_FORM, with_modrm + SIZES_ARRAY[codes], lengths)
+    lengths = numpy.where((form == SEGMENT_FORM) & (reg <= 3), with_modrm, lengths)
+    group1 = numpy.where(reg == 0, with_modrm + 1 + (codes & 0x01), with_modrm)
+    lengths = numpy.where((form == GROUP1) & GROUP1_VALID_ARRAY[reg], group1, lengths)
+    group2 = numpy.where(reg == 3, 4, with_modrm)
+    group2_valid = numpy.where(codes & 0x01, GROUP2_VALID_ARRAY[reg], GROUP2_BYTE_VALID_ARRAY[reg])
+    lengths = numpy.where((form == GROUP2) & group2_valid, group2, lengths)
+
+    prefixes = numpy.flatnonzero(form[:-1] == PREFIX)
+    while len(prefixes):
+        following = lengths[prefixes + 1]
+        updated = numpy.where(following > 0, following + 1, 0)
+        if numpy.array_equal(updated, lengths[prefixes]):
+            break
+        lengths[prefixes] = updated
+
+    lengths[numpy.arange(len(codes)) + lengths > len(codes)] = 0
+    lengths[lengths > 0xff] = 0
+    return lengths.astype(numpy.uint8)
+
+
+class LinearSweep(object):
+    def __init__(self, program, starts):
+        self.program = program
+        self.lengths = length_table(program)
+        self.segments = numpy.zeros(len(self.lengths), dtype=numpy.uint16)
+        self.__chain(starts)
+
+    def __chain(self, starts):
+        lengths = self.lengths.tobytes()
+        is_start = bytearray(len(lengths))
+        for start in starts:
+            offset = start.linear
+            first = offset
+            while offset < len(lengths) and not is_start[offset] and lengths[offset]:
+                is_start[offset] = 1
+                offset += lengths[offset]
+            self.segments[first:offset] = start.segment
+        self.starts = numpy.frombuffer(is_start, dtype=numpy.bool_)
+
+    def boundaries(self):
+        return numpy.flatnonzero(self.starts)
+
+    def __len__(self):
+        return int(numpy.count_nonzero(self.starts))
+
+    def __iter__(self):
+        for linear in self.boundaries().tolist():
+            instruction = Instruction.decode(self.program, linear)
+            segment = int(self.segments[linear])
+            instruction.address = Address(segment, linear - segment * 16)
+            yield instruction
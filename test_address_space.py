@@ -0,0 +1,68 @@
+from nose.tools import istest, eq_, ok_, raises
+
+from address_space import AddressSpace
+
+
+def space():
+    space = AddressSpace()
+    space.map(0, bytearray(b'\x01\x02\x03'))
+    space.append(b'\x04\x05')
+    space.append(memoryview(b'\x06'))
+    return space
+
+
+@istest
+def placement():
+    regions = space()
+    eq_(regions.starts, [0x00, 0x10, 0x20])
+    eq_(len(regions), 0x21)
+    eq_([regions.region(linear) for linear in (0x00, 0x02, 0x03, 0x11, 0x12, 0x20, 0x21)], [0, 0, None, 1, None, 2, None])
+
+
+@istest
+def reads():
+    regions = space()
+    eq_((regions[0x01], regions[0x05], regions[0x11], regions[-1]), (0x02, 0x00, 0x05, 0x06))
+    eq_(regions[0x02:0x12], b'\x03' + bytes(13) + b'\x04\x05')
+    eq_(bytes(regions.view()), regions[:])
+
+
+@istest
+def writes():
+    regions = space()
+    view = regions.view()
+    regions.write(0x10, b'\xbb\xcc')
+    eq_(regions[0x0e:0x14], b'\x00\x00\xbb\xcc\x00\x00')
+    ok_(regions.view() is view)
+    eq_(bytes(view), regions[:])
+    regions.write(0x20, b'\xee')
+    eq_(regions.view()[0x20], 0xee)
+
+
+@istest
+def single_region_is_not_copied():
+    load_module = bytearray(b'\x90\xc3')
+    regions = AddressSpace()
+    regions.map(0, load_module)
+    ok_(regions.view() is load_module)
+    regions.write(0, b'\xcc')
+    eq_(load_module[0], 0xcc)
+
+
+@istest
+@raises(Exception)
+def overlapping():
+    space().map(0x11, b'\x00')
+
+
+@istest
+def gap_writes():
+    regions = space()
+    for offset, data in ((0x0f, b'\xaa\xbb'), (0x11, b'\xaa\xbb'), (0x03, b'\xaa'), (0x21, b'\xaa')):
+        try:
+            regions.write(offset, data)
+        except Exception:
+            pass
+        else:
+            ok_(False, 'write at %x' % offset)
+    eq_(regions[:], b'\x01\x02\x03' + bytes(13) + b'\x04\x05' + bytes(14) + b'\x06')
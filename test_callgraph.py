@@ -0,0 +1,145 @@
+from nose.tools import istest, eq_, ok_
+
+from address import Address
+from callgraph import CallGraph, ADDRESS_ORDER, BREADTH_FIRST, DEPTH_FIRST
+from policy import TraversalPolicy, PROCEDURE_LIMIT, INSTRUCTION_LIMIT
+from test_loader import program
+
+
+# 0000: jcxz 0006; call 0020; ret
+# 0006: call 0010; ret
+# 0010: call 0030; ret
+# 0020: call 0030; ret
+# 0030: call far [bx]; ret
+CODE = (b'\xe3\x04\xe8\x1b\x00\xc3\xe8\x07\x00\xc3' + bytes(6) +
+        b'\xe8\x1d\x00\xc3' + bytes(12) +
+        b'\xe8\x0d\x00\xc3' + bytes(12) +
+        b'\xff\x1f\x00\x00\xc3')
+
+
+def explore(order=ADDRESS_ORDER, target=None, policy=None):
+    traversal = program(CODE)
+    return CallGraph(traversal, order, policy).explore([traversal.address], target)
+
+
+@istest
+def edges():
+    graph = explore()
+    eq_(sorted(procedure.entry.linear for procedure in graph), [0x00, 0x10, 0x20, 0x30])
+    eq_(graph[Address(0, 0)].callees, {0x10, 0x20})
+    eq_(graph[Address(0, 0x30)].callers, {0x10, 0x20})
+    eq_(len(graph[Address(0, 0x30)].indirect_calls), 1)
+    ok_(all(procedure.returns for procedure in graph))
+    eq_(graph.reachable(Address(0, 0x10)), {0x10, 0x30})
+
+
+@istest
+def orders():
+    eq_(explore(ADDRESS_ORDER).explored, [0x00, 0x10, 0x20, 0x30])
+    eq_(explore(BREADTH_FIRST).explored, [0x00, 0x20, 0x10, 0x30])
+    eq_(explore(DEPTH_FIRST).explored, [0x00, 0x10, 0x30, 0x20])
+
+
+@istest
+def stop_when_target_done():
+    graph = explore(DEPTH_FIRST, target=Address(0, 0x10))
+    eq_(graph.explored, [0x00, 0x10, 0x30])
+    ok_(not graph[Address(0, 0x20)].explored)
+
+
+@istest
+def target_waits_for_transitive_callees():
+    # 0000: jcxz 0006; call 0010; ret
+    # 0006: call 0020; ret
+    # 0010: call 0040; ret
+    # 0020: call 0010; ret
+    # 0040: ret
+    code = (b'\xe3\x04\xe8\x0b\x00\xc3\xe8\x17\x00\xc3' + bytes(6) +
+            b'\xe8\x2d\x00\xc3' + bytes(12) +
+            b'\xe8\xed\xff\xc3' + bytes(28) +
+            b'\xc3')
+    traversal = program(code)
+    graph = CallGraph(traversal).explore([traversal.address], Address(0, 0x20))
+    eq_(graph.explored, [0x00, 0x10, 0x20, 0x40])
+    ok_(graph[Address(0, 0x20)].returns)
+
+
+@istest
+def budgets():
+    graph = explore(policy=TraversalPolicy(max_procedure_instructions=2))
+    eq_(graph[Address(0, 0)].truncated, PROCEDURE_LIMIT)
+    eq_(len(graph[Address(0, 0)].instructions), 2)
+    eq_(graph[Address(0, 0x20)].truncated, None)
+    graph = explore(policy=TraversalPolicy(max_instructions=5))
+    eq_(graph.stopped, INSTRUCTION_LIMIT)
+    eq_(graph.explored, [0x00, 0x10, 0x20])
+
+
+# 0000: call 0010; call 0020; call 0030; ret
+# 0010: mov ah, 4Ch; mov al, 1; int 21h
+# 0020: jmp 0020
+# 0030: ret
+NO_RETURN = (b'\xe8\x0d\x00\xe8\x1a\x00\xe8\x27\x00\xc3' + bytes(6) +
+             b'\xb4\x4c\xb0\x01\xcd\x21' + bytes(10) +
+             b'\xeb\xfe' + bytes(14) +
+             b'\xc3')
+
+
+@istest
+def no_return():
+    traversal = program(NO_RETURN)
+    graph = CallGraph(traversal).explore([traversal.address])
+    eq_(graph.no_return(), {0x00, 0x10})
+    eq_(list(graph[Address(0, 0)].instructions), [0x00])
+    eq_(graph[Address(0, 0x10)].exits, [Address(0, 0x14)])
+    eq_([procedure.entry.linear for procedure in graph], [0x00, 0x10])
+
+
+@istest
+def recursion_returns():
+    # 0000: jcxz 0005; call 0000; ret
+    code = b'\xe3\x03\xe8\xfb\xff\xc3'
+    traversal = program(code)
+    procedure = CallGraph(traversal).explore([traversal.address])[Address(0, 0)]
+    ok_(procedure.returns)
+    eq_(list(procedure.instructions), [0x00, 0x02, 0x05])
+
+
+# 0000: call 0010; nop; ret
+# 0010: nop; nop; nop; ret
+PARTIAL = b'\xe8\x0d\x00\x90\xc3' + bytes(11) + b'\x90\x90\x90\xc3'
+
+
+@istest
+def unknown_is_not_no_return():
+    for policy in (TraversalPolicy(max_procedure_instructions=2), TraversalPolicy(max_instructions=3),
+                   TraversalPolicy(stop_addresses=[Address(0, 0x12)])):
+        traversal = program(PARTIAL)
+        graph = CallGraph(traversal, policy=policy).explore([traversal.address])
+        ok_(not graph[Address(0, 0x10)].returns)
+        eq_(graph.no_return(), set())
+    traversal = program(PARTIAL)
+    graph = CallGraph(traversal, policy=TraversalPolicy(stop_addresses=[Address(0, 0x12)])).explore([traversal.address])
+    eq_(graph[Address(0, 0x10)].stops, [Address(0, 0x12)])
+    eq_(list(graph[Address(0, 0)].instructions), [0x00, 0x03, 0x04])
+    ok_(graph[Address(0, 0)].returns)
+    # 0000: call 0004; ret
+    # 0004: call 0008; ret
+    # 0008: ret
+    traversal = program(b'\xe8\x01\x00\xc3\xe8\x01\x00\xc3\xc3')
+    graph = CallGraph(traversal, policy=TraversalPolicy(max_instructions=2)).explore([traversal.address])
+    ok_(not graph[Address(0, 8)].explored)
+    eq_(graph.no_return(), set())
+    traversal.policy = TraversalPolicy(max_instructions=2)
+    eq_(traversal.find_no_return(), set())
+
+
+@istest
+def undecodable_callee():
+    # 0000: call f000:0000; nop; ret
+    code = b'\x9a\x00\x00\x00\xf0\x90\xc3'
+    traversal = program(code)
+    graph = CallGraph(traversal).explore([traversal.address])
+    eq_(graph[Address(0xf000, 0)].undecodable, {0xf0000})
+    eq_(list(graph[Address(0, 0)].instructions), [0x00, 0x05, 0x06])
+    eq_(graph.no_return(), set())
@@ -0,0 +1,34 @@
+from nose.tools import istest, eq_
+
+from cfg import ControlFlowGraph
+from flow import BRANCH, CALL, JUMP, RETURN
+from test_loader import program
+
+
+def build(code):
+    traversal = program(code)
+    return ControlFlowGraph.build(traversal, [traversal.address])
+
+
+@istest
+def diamond():
+    # 0: cmp ax, dx; jz 8; mov cl, 4; jmp short 10; 8: mov cl, 5; 10: ret
+    graph = build(b'\x3b\xc2\x74\x04\xb1\x04\xeb\x02\xb1\x05\xc3')
+    eq_(list(graph.block_start), [0, 4, 8, 10])
+    eq_(list(graph.block_end), [4, 8, 10, 11])
+    eq_(list(graph.block_flow), [BRANCH, JUMP, 0, RETURN])
+    eq_([list(graph.successors_of(index)) for index in range(len(graph))], [[1, 2], [3], [3], []])
+    eq_([list(graph.predecessors_of(index)) for index in range(len(graph))], [[], [0], [0], [1, 2]])
+
+
+@istest
+def loop_and_call():
+    # 0: mov cx, 12h; 3: call 9; 6: loop 3; 8: ret; 9: nop; ret
+    graph = build(b'\xb9\x12\x00\xe8\x03\x00\xe2\xfb\xc3\x90\xc3')
+    eq_(list(graph.block_start), [0, 3, 6, 8, 9])
+    eq_(list(graph.block_flow), [0, CALL, BRANCH, RETURN, RETURN])
+    eq_([list(graph.successors_of(index)) for index in range(len(graph))], [[1], [2], [3, 1], [], []])
+    eq_(graph.calls, [(3, 9)])
+    eq_(graph.block_of(7), 2)
+    eq_(['%s %s' % (instruction.address, instruction) for instruction in graph.instructions(4)],
+        ['0000:0009 nop', '0000:000A ret'])
@@ -0,0 +1,44 @@
+from nose.tools import istest, eq_, assert_is, assert_is_not
+
+from decode_cache import DecodeCache
+from test_loader import program
+
+
+@istest
+def reuse():
+    cache = DecodeCache(bytearray(b'\x8b\x5d\x08\xc3'))
+    first = cache.decode(0)
+    assert_is(cache.decode(0), first)
+    eq_((cache.hits, cache.misses), (1, 1))
+
+
+@istest
+def least_recently_used_evicted():
+    cache = DecodeCache(bytearray(b'\x90\x90\x90\x90'), size=2)
+    cache.decode(0)
+    cache.decode(1)
+    cache.decode(0)
+    cache.decode(2)
+    eq_(sorted(cache.instructions), [0, 2])
+
+
+@istest
+def write_invalidates_overlapping():
+    traversal = program(b'\x90\xb8\x12\x00\x90\xc3')
+    nop = traversal.cache.decode(0)
+    mov = traversal.cache.decode(1)
+    after = traversal.cache.decode(4)
+    traversal.write(3, b'\x34')
+    assert_is(traversal.cache.decode(0), nop)
+    assert_is(traversal.cache.decode(4), after)
+    assert_is_not(traversal.cache.decode(1), mov)
+    eq_(str(traversal.cache.decode(1)), 'mov ax, 3412h')
+
+
+@istest
+def retraversal_hits_cache():
+    traversal = program(b'\x90\xe8\x01\x00\xc3\xc3')
+    first = [str(instruction) for instruction in traversal]
+    second = [str(instruction) for instruction in traversal]
+    eq_(first, second)
+    eq_(traversal.cache.misses, 4)
@@ -0,0 +1,25 @@
+from nose.tools import istest, eq_
+
+from decoded_program import MEMORY_OPERAND, REGISTER_OPERAND, IMMEDIATE_OPERAND, NO_TARGET
+from test_loader import program
+
+
+@istest
+def columns():
+    decoded = program(b'\x8b\x5d\x08\xb1\x04\xe8\x01\x00\xc3\x90\xc3').decode()
+    eq_(list(decoded.linear), [0, 3, 5, 9, 10, 8])
+    eq_(list(decoded.length), [3, 2, 3, 1, 1, 1])
+    eq_(list(decoded.opcode), [0x8b, 0xb1, 0xe8, 0x90, 0xc3, 0xc3])
+    eq_([decoded.mnemonics[mnemonic] for mnemonic in decoded.mnemonic], ['mov', 'mov', 'call', 'nop', 'ret', 'ret'])
+    eq_((decoded.destination_kind[0], decoded.source_kind[0]), (REGISTER_OPERAND, MEMORY_OPERAND))
+    eq_((decoded.destination_kind[1], decoded.source_kind[1]), (REGISTER_OPERAND, IMMEDIATE_OPERAND))
+    eq_(list(decoded.target), [NO_TARGET, NO_TARGET, 9, NO_TARGET, NO_TARGET, NO_TARGET])
+
+
+@istest
+def materialise():
+    decoded = program(b'\x8b\x5d\x08\xb1\x04\xc3').decode()
+    eq_(len(decoded), 3)
+    eq_(['%s %s' % (instruction.address, instruction) for instruction in decoded],
+        ['0000:0000 mov bx, [di+8]', '0000:0003 mov cl, 4', '0000:0005 ret'])
+    eq_(decoded.select('mov'), [0, 1])
@@ -1,6 +1,6 @@
-from nose.tools import istest, eq_
+from nose.tools import istest, eq_, assert_raises, assert_false, assert_is
 
-from instructions import Instruction
+from instructions import Instruction, Register
 
 
 @istest
@@ -199,6 +199,13 @@ def les_c4():
     eq_(len(instruction), 3)
 
 
+@istest
+def lds_c5_direct():
+    instruction = Instruction.decode(b'\xc5\x06\x0d\xfa', 0)
+    eq_(str(instruction), 'lds ax, FA0Dh')
+    eq_(len(instruction), 4)
+
+
 @istest
 def int_cd():
     instruction = Instruction.decode(b'\xcd\x21', 0)
@@ -213,6 +220,13 @@ def shr_d3():
     eq_(len(instruction), 2)
 
 
+@istest
+def sar_d1():
+    instruction = Instruction.decode(b'\xd1\xf8', 0)
+    eq_(str(instruction), 'sar ax, 1')
+    eq_(len(instruction), 2)
+
+
 @istest
 def loop_e2():
     instruction = Instruction.decode(b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\xe2\xf0', 16)
@@ -246,3 +260,46 @@ def push_ff():
     instruction = Instruction.decode(b'\xff\x36\x26\x26', 0)
     eq_(str(instruction), 'push 2626h')
     eq_(len(instruction), 4)
+
+
+@istest
+def inc_ff():
+    instruction = Instruction.decode(b'\xff\x06\x10\x00', 0)
+    eq_(str(instruction), 'inc 10h')
+    eq_(len(instruction), 4)
+
+
+@istest
+def mov_memoryview():
+    program = memoryview(bytearray(b'\x90\x8b\x5d\x08'))
+    instruction = Instruction.decode(program, 1)
+    eq_(str(instruction), 'mov bx, [di+8]')
+    eq_(len(instruction), 3)
+
+
+@istest
+def no_instance_dict():
+    instruction = Instruction.decode(b'\x26\x8b\x5d\x08', 0)
+    assert_false(hasattr(instruction, '__dict__'))
+    assert_false(hasattr(instruction.instruction.modreg, '__dict__'))
+    assert_false(hasattr(instruction.instruction.destination, '__dict__'))
+
+
+@istest
+def shared_operands():
+    first = Instruction.decode(b'\x04\x01', 0)
+    second = Instruction.decode(b'\xd1\xe0', 0)
+    assert_is(first.destination, Register.get(0, False))
+    assert_is(first.source, second.source)
+
+
+@istest
+def unimplemented_0f():
+    assert_raises(Exception, Instruction.decode, b'\x0f', 0)
+
+
+@istest
+def byte_grp2_is_inc_dec_only():
+    eq_(str(Instruction.decode(b'\xfe\x07', 0)), 'inc [bx]')
+    for modrm in (b'\x18', b'\x20', b'\x28', b'\x30'):
+        assert_raises(Exception, Instruction.decode, b'\xfe' + modrm + bytes(4), 0)
@@ -0,0 +1,64 @@
+from nose.tools import istest, eq_
+
+from address import Address
+from callgraph import CallGraph
+from cfg import ControlFlowGraph
+from test_loader import program
+
+
+# 0000: cmp bx, 2; ja 0011; shl bx, 1; jmp cs:[bx+0014]
+# 0011: ret
+# 0014: dw 001A, 001C, 001E
+# 001A: inc ax; ret; inc cx; ret; inc dx; ret
+SWITCH = (b'\x83\xfb\x02\x77\x0c\xd1\xe3\x2e\xff\xa7\x14\x00' + bytes(5) + b'\xc3' + bytes(2) +
+          b'\x1a\x00\x1c\x00\x1e\x00' + b'\x40\xc3\x41\xc3\x42\xc3')
+
+
+def traversed(code):
+    return sorted(instruction.address.linear for instruction in program(code))
+
+
+@istest
+def switch():
+    eq_(traversed(SWITCH), [0x00, 0x03, 0x05, 0x07, 0x11, 0x1a, 0x1b, 0x1c, 0x1d, 0x1e, 0x1f])
+
+
+@istest
+def inverted_guard():
+    # 0000: cmp bx, 2; jbe 0007; ret; nop; shl bx, 1; jmp cs:[bx+0014]
+    code = b'\x83\xfb\x02\x76\x02\xc3\x90\xd1\xe3\x2e\xff\xa7\x14\x00' + SWITCH[0x0e:]
+    eq_(traversed(code), [0x00, 0x03, 0x05, 0x07, 0x09, 0x1a, 0x1b, 0x1c, 0x1d, 0x1e, 0x1f])
+
+
+@istest
+def clobbered_index():
+    # 0000: cmp bx, 2; ja 0011; shl bx, 1; inc bx; jmp cs:[bx+0014]
+    code = b'\x83\xfb\x02\x77\x0c\xd1\xe3\x43\x2e\xff\xa7\x14\x00' + SWITCH[0x0d:]
+    eq_(traversed(code), [0x00, 0x03, 0x05, 0x07, 0x08, 0x11])
+
+
+@istest
+def unguarded():
+    # 0000: shl bx, 1; jmp cs:[bx+0014]
+    code = b'\xd1\xe3\x2e\xff\xa7\x14\x00' + SWITCH[0x07:]
+    eq_(traversed(code), [0x00, 0x02])
+
+
+@istest
+def high_table():
+    # 0000: cmp bx, 2; ja 0011; shl bx, 1; jmp cs:[bx+9000]
+    # 9000: dw 001A, 001C, 001E
+    code = SWITCH[:0x0a] + b'\x00\x90' + SWITCH[0x0c:0x14] + bytes(6) + SWITCH[0x1a:]
+    code += bytes(0x9000 - len(code)) + SWITCH[0x14:0x1a]
+    eq_(traversed(code), [0x00, 0x03, 0x05, 0x07, 0x11, 0x1a, 0x1b, 0x1c, 0x1d, 0x1e, 0x1f])
+
+
+@istest
+def graphs():
+    switch = program(SWITCH)
+    procedure = CallGraph(switch).explore([switch.address])[Address(0, 0)]
+    eq_([target.linear for (_, target) in procedure.jump_tables], [0x1a, 0x1c, 0x1e])
+    eq_(procedure.returns, True)
+    graph = ControlFlowGraph.build(switch, [switch.address])
+    eq_(list(graph.block_start), [0x00, 0x05, 0x11, 0x1a, 0x1c, 0x1e])
+    eq_(list(graph.successors_of(1)), [3, 4, 5])
@@ -0,0 +1,35 @@
+from nose.tools import istest, eq_
+
+from flow import FALLTHROUGH, JUMP, BRANCH, CALL, RETURN
+from instructions import Instruction
+from length_decoder import instruction_length, instruction_flow
+
+
+def decoded_length(program, offset):
+    try:
+        return len(Instruction.decode(program, offset))
+    except Exception:
+        return 0
+
+
+@istest
+def lengths_match_decoder():
+    for prefix in (b'', b'\x26', b'\xf3\x2e'):
+        for code in range(256):
+            for modrm in range(256):
+                for tail in (bytes(6), b'\xff' * 6):
+                    program = prefix + bytes((code, modrm)) + tail
+                    eq_(instruction_length(program, 0), decoded_length(program, 0), program.hex())
+
+
+@istest
+def flows():
+    eq_(instruction_flow(b'\x90', 0), FALLTHROUGH)
+    eq_(instruction_flow(b'\xeb\x05', 0), JUMP)
+    eq_(instruction_flow(b'\x75\xf2', 0), BRANCH)
+    eq_(instruction_flow(b'\xe8\x10\x02', 0), CALL)
+    eq_(instruction_flow(b'\x2e\xff\x1e\x10\x00', 0), CALL)
+    eq_(instruction_flow(b'\x2e\xff\xa7\x10\x00', 0), JUMP)
+    eq_(instruction_flow(b'\xfe\x20', 0), FALLTHROUGH)
+    eq_(instruction_length(b'\xfe\x20', 0), 0)
+    eq_(instruction_flow(b'\xcb', 0), RETURN)
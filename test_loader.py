@@ -0,0 +1,131 @@
+import io
+
+from nose.tools import istest, eq_, ok_
+
+from address import Address
+from loader import Program
+from policy import TraversalPolicy, INSTRUCTION_LIMIT, BYTE_LIMIT, DEADLINE
+
+
+def program(code, address=Address(0, 0)):
+    return Program(io.BytesIO(code), len(code), address)
+
+
+def listing(program):
+    return ['%s %s' % (instruction.address, instruction) for instruction in program]
+
+
+@istest
+def hashable_address():
+    eq_(len({Address(0x10, 4), Address(0x10, 4), Address(0x10, 5)}), 2)
+
+
+@istest
+def aliased_addresses():
+    eq_(Address(0x0000, 0x0156), Address(0x0015, 0x0006))
+    eq_(hash(Address(0x0000, 0x0156)), hash(Address(0x0015, 0x0006)))
+    eq_(str(Address(0x0015, 0x0006)), '0015:0006')
+
+
+@istest
+def offset_wraparound():
+    eq_(str(Address(0x1000, 0xfffe) + 3), '1000:0001')
+    eq_(str(Address(0x1000, 0x0002) + -4), '1000:FFFE')
+
+
+@istest
+def aliased_far_call_decoded_once():
+    # 0000:0000 call 0001:0000; 0000:0005 call 0000:0010; 0000:000A ret; 0000:0010 nop; ret
+    code = b'\x9a\x00\x00\x01\x00\x9a\x10\x00\x00\x00\xcb' + bytes(5) + b'\x90\xcb'
+    eq_(listing(program(code)),
+        ['0000:0000 call 0001:0000', '0001:0000 nop', '0001:0001 ret', '0000:0005 call 0000:0010', '0000:000A ret'])
+
+
+@istest
+def fallthrough_into_visited_code():
+    # call 0005; jmp short 0005; ...; 0005: nop; ret
+    eq_(listing(program(b'\xe8\x02\x00\xeb\x00\x90\xc3')),
+        ['0000:0000 call 0002h', '0000:0005 nop', '0000:0006 ret', '0000:0003 jmp 00'])
+
+
+@istest
+def coverage():
+    # 0000:0000 mov ax, 12h; call 0001:0000; ret; <data>; 0001:0000 nop; ret
+    code = b'\xb8\x12\x00\x9a\x00\x00\x01\x00\xcb' + bytes(7) + b'\x90\xcb' + bytes(14)
+    iterator = iter(program(code))
+    list(iterator)
+    eq_([offset for offset in range(len(code)) if iterator.coverage.is_start(offset)], [0, 3, 8, 16, 17])
+    ok_(iterator.coverage.is_covered(7))
+    ok_(not iterator.coverage.is_covered(9))
+    ok_(iterator.coverage.overlaps(6, 4))
+    eq_(iterator.segment_coverage(), {0: 9 / 16, 1: 2 / 16})
+
+
+@istest
+def stop_address():
+    # 0000: jcxz 0004; nop; ret
+    # 0004: nop; ret
+    traversal = program(b'\xe3\x02\x90\xc3\x90\xc3')
+    traversal.policy = TraversalPolicy(stop_addresses=[Address(0, 4)])
+    iterator = iter(traversal)
+    eq_([instruction.address.linear for instruction in iterator], [0, 2, 3])
+    eq_(iterator.stops, [Address(0, 4)])
+    eq_(iterator.stopped, None)
+
+
+@istest
+def limits():
+    code = b'\xb8\x12\x00' * 10 + b'\xc3'
+    for policy, decoded, reason in ((TraversalPolicy(max_instructions=4), 4, INSTRUCTION_LIMIT),
+                                    (TraversalPolicy(max_bytes=7), 3, BYTE_LIMIT),
+                                    (TraversalPolicy(deadline=0), 0, DEADLINE),
+                                    (TraversalPolicy(), 11, None)):
+        traversal = program(code)
+        traversal.policy = policy
+        iterator = iter(traversal)
+        eq_(len(list(iterator)), decoded)
+        eq_(iterator.stopped, reason)
+
+
+@istest
+def no_return_fallthrough():
+    # 0000: call 0006; mov ax, 4C00h
+    # 0006: jmp 0006
+    traversal = program(b'\xe8\x03\x00\xb8\x00\x4c\xeb\xfe')
+    eq_(len(list(traversal)), 3)
+    eq_(traversal.find_no_return(), {0x00, 0x06})
+    eq_(listing(traversal), ['0000:0000 call 0003h', '0000:0006 jmp -2'])
+    traversal = program(b'\xb8\x00\x4c\xcd\x21\xff\xff')
+    eq_(len(list(traversal)), 2)
+
+
+@istest
+def unknown_keeps_fallthrough():
+    # 0000: call 0010; nop; ret
+    # 0010: nop; nop; nop; ret
+    code = b'\xe8\x0d\x00\x90\xc3' + bytes(11) + b'\x90\x90\x90\xc3'
+    for policy in (TraversalPolicy(max_procedure_instructions=2), TraversalPolicy(max_instructions=3),
+                   TraversalPolicy(stop_addresses=[Address(0, 0x12)])):
+        traversal = program(code)
+        traversal.policy = policy
+        eq_(traversal.find_no_return(), set())
+        traversal.policy = TraversalPolicy()
+        ok_({'0000:0003 nop', '0000:0004 ret'} <= set(listing(traversal)))
+    # 0000: call f000:0000; nop; ret
+    traversal = program(b'\x9a\x00\x00\x00\xf0\x90\xc3')
+    eq_(traversal.find_no_return(), set())
+    eq_(listing(traversal), ['0000:0000 call f000:0000', '0000:0005 nop', '0000:0006 ret'])
+
+
+@istest
+def shared_budget():
+    # 0000: call 0006; mov ax, 4C00h
+    # 0006: jmp 0006
+    traversal = program(b'\xe8\x03\x00\xb8\x00\x4c\xeb\xfe')
+    traversal.policy = TraversalPolicy(max_instructions=3)
+    budget = traversal.policy.budget()
+    eq_(traversal.find_no_return(budget), {0x00, 0x06})
+    iterator = traversal.traverse(budget)
+    eq_(len(list(iterator)), 1)
+    eq_(iterator.stopped, INSTRUCTION_LIMIT)
+    eq_(budget.instructions, 3)
@@ -0,0 +1,84 @@
+import os
+import shutil
+import struct
+import tempfile
+
+from nose.tools import istest, eq_, ok_
+
+from loader import Loader
+from overlay import Overlay
+
+
+# Load module: entry at 0000:0000 far calls the first stub entry at 0002:0020, which the overlay patches
+CODE = b'\x9a\x20\x00\x02\x00\xcb' + bytes(26)
+STUB = struct.pack('<HHIHHH', 0x3fcd, 0, 0, 4, 2, 1) + bytes(18) + b'\xcd\x3f\x00\x00\x00'
+UNIT = b'\x90\xcb\x00\x00' + struct.pack('<H', 1)
+
+
+def exe(code, relocations=((0x0003, 0x0000),)):
+    paragraphs = (28 + len(relocations) * 4 + 15) // 16
+    size = paragraphs * 16 + len(code)
+    header = struct.pack('<HHHHHHHHHHHHHH', 0x5a4d, size % 512, (size + 511) // 512, len(relocations), paragraphs,
+                         0, 0, 0, 0, 0, 0, 0, 28, 0)
+    table = b''.join(struct.pack('<HH', offset, segment) for (offset, segment) in relocations)
+    return header + table + bytes(paragraphs * 16 - 28 - len(table)) + code
+
+
+class Files(object):
+    def __init__(self, relocations=((0x0003, 0x0000),), stubs=STUB, units=UNIT):
+        self.relocations = relocations
+        self.stubs = stubs
+        self.units = units
+
+    def __enter__(self):
+        self.directory = tempfile.mkdtemp()
+        self.exe = os.path.join(self.directory, 'start.exe')
+        self.ovr = os.path.join(self.directory, 'game.ovr')
+        with open(self.exe, 'wb') as file:
+            file.write(exe(CODE + self.stubs, self.relocations))
+        with open(self.ovr, 'wb') as file:
+            file.write(self.units)
+        return self
+
+    def __exit__(self, *args):
+        shutil.rmtree(self.directory)
+
+
+def load(files, mapped):
+    loader = Loader(files.exe, mapped)
+    loader.fetch_header()
+    program = loader.load_program()
+    return loader, program
+
+
+@istest
+def mapped_matches_read():
+    with Files() as files:
+        images = []
+        for mapped in (False, True):
+            loader, program = load(files, mapped)
+            Overlay(files.ovr, program, mapped).overlay_code()
+            images.append(bytes(program.program))
+        eq_(images[0], images[1])
+        eq_(images[1][0x50:0x52], b'\x90\xcb')
+
+
+@istest
+def copy_on_write():
+    with Files() as files:
+        loader, program = load(files, True)
+        ok_(isinstance(program.program, memoryview))
+        program.write(0, b'\xc3')
+        eq_(program.program[0], 0xc3)
+        with open(files.exe, 'rb') as file:
+            eq_(file.read()[loader.header_size], 0x9a)
+
+
+@istest
+def traversal_does_not_flatten():
+    with Files() as files:
+        loader, program = load(files, True)
+        Overlay(files.ovr, program, True).overlay_code()
+        eq_(len(program.space.regions), 2)
+        eq_(len(list(program)), 4)
+        ok_(program.space.contiguous is None)
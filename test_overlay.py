@@ -0,0 +1,84 @@
+import struct
+
+from nose.tools import istest, eq_, ok_
+
+from address import Address
+from cfg import ControlFlowGraph
+from listing import format_instruction
+from overlay import Overlay
+from sweep import LinearSweep
+from test_mapping import Files, STUB, UNIT, load
+
+
+# A second unit at file offset 6 that nothing calls
+SECOND_STUB = struct.pack('<HHIHHH', 0x3fcd, 0, 6, 2, 0, 1) + bytes(18) + b'\xcd\x3f\x00\x00\x00'
+SECOND_UNIT = b'\xc3\x00'
+
+
+@istest
+def preallocated_image():
+    with Files() as files:
+        loader, program = load(files, False)
+        Overlay(files.ovr, program).overlay_code()
+        eq_(len(program.space.regions), 1)
+        eq_(program.units, [(0x50, 0x54)])
+        eq_(program.program[0x40:0x45], b'\xea\x00\x00\x05\x00')
+
+
+@istest
+def lazy_units():
+    with Files(stubs=STUB + bytes(11) + SECOND_STUB, units=UNIT + SECOND_UNIT) as files:
+        for mapped in (False, True):
+            loader, program = load(files, mapped)
+            Overlay(files.ovr, program, mapped).overlay_code(lazy=True)
+            eq_(sorted(program.deferred), [0x40, 0x70])
+            if mapped:
+                eq_(len(program.space.regions), 1)
+            else:
+                eq_(program.program[0x80:0x82], bytes(2))
+            listing = ['%s %s' % (instruction.address, instruction) for instruction in program]
+            eq_(listing, ['0000:0000 call 0002:0020', '0008:0000 nop', '0008:0001 ret', '0000:0005 ret'])
+            eq_(sorted(program.deferred), [0x70])
+            if mapped:
+                eq_([start for (start, _, _) in program.space.regions], [0x00, 0x80])
+                ok_(program.space.contiguous is None)
+            else:
+                eq_(program.program[0x90:0x92], bytes(2))
+            program.load_units()
+            eq_(program.program[0x70:0x75], b'\xea\x00\x00\x09\x00')
+            eq_(program.program[0x90:0x92], SECOND_UNIT)
+
+
+@istest
+def stub_index():
+    with Files(stubs=STUB + bytes(11) + SECOND_STUB, units=UNIT + SECOND_UNIT) as files:
+        for lazy in (False, True):
+            loader, program = load(files, False)
+            Overlay(files.ovr, program).overlay_code(lazy)
+            eq_(sorted(program.stubs.entries), [0x40, 0x70])
+            eq_(program.stubs.resolve(Address(2, 0x20)), Address(8, 0))
+            eq_(program.stubs.resolve(Address(5, 0x20)), Address(9, 0))
+            eq_(program.stubs.unit(Address(7, 0)), 1)
+            eq_(program.stubs.resolve(Address(0, 5)), Address(0, 5))
+            eq_(program.stubs.unit(Address(0, 5)), None)
+            listing = [format_instruction(instruction, program.stubs) for instruction in program]
+            eq_(listing, ['0000:0000 call 0002:0020 ; unit 0 0008:0000', '0008:0000 nop', '0008:0001 ret',
+                          '0000:0005 ret'])
+            eq_(ControlFlowGraph.build(program, [program.address]).calls, [(0x00, 0x80)])
+            ok_(0x40 not in ControlFlowGraph.build(program, [program.address]).block_start)
+            eq_(program.decode().target[0], 0x80)
+            eq_(format_instruction(next(iter(LinearSweep(program.program, [program.address]))), program.stubs),
+                '0000:0000 call 0002:0020 ; unit 0 0008:0000')
+
+
+@istest
+def stub_scan():
+    # Both entries of the first stub read CD 3F 00 00; the load module ends in a truncated stub
+    stubs = (struct.pack('<HHIHHH', 0x3fcd, 0, 0, 4, 2, 2) + bytes(18) + b'\xcd\x3f\x00\x00\x00' * 2 +
+             bytes(6) + SECOND_STUB + b'\xcd\x3f\x00')
+    with Files(stubs=stubs, units=UNIT + SECOND_UNIT) as files:
+        loader, program = load(files, False)
+        eq_(program.program[-3:], b'\xcd\x3f\x00')
+        Overlay(files.ovr, program).overlay_code(lazy=True)
+        eq_(sorted(program.stubs.entries), [0x40, 0x45, 0x70])
+        eq_(len(program.units), 2)
@@ -0,0 +1,30 @@
+from nose.tools import istest, eq_
+
+from callgraph import CallGraph
+from parallel import ProcedurePool
+from test_callgraph import CODE, NO_RETURN
+from test_jump_table import SWITCH
+from test_loader import program
+
+
+def summary(graph):
+    return dict((procedure.entry.linear, (list(procedure.instructions), procedure.returns, sorted(procedure.callers),
+                                          sorted(procedure.callees)))
+                for procedure in graph)
+
+
+@istest
+def matches_serial():
+    # call 9000:0000 lies outside the image
+    for code in (CODE, NO_RETURN, SWITCH, b'\x9a\x00\x00\x00\x90\xc3'):
+        serial = program(code)
+        expected = CallGraph(serial).explore([serial.address])
+        serial.no_return = expected.no_return()
+        shared = program(code)
+        with ProcedurePool(shared, 2) as pool:
+            graph = CallGraph(shared, pool=pool).explore([shared.address])
+            lines = pool.listing(graph)
+        eq_(summary(graph), summary(expected))
+        eq_(graph.no_return(), expected.no_return())
+        eq_(lines, ['%s %s' % (instruction.address, instruction) for instruction in
+                    sorted(serial, key=lambda instruction: instruction.address.linear)])
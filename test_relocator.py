@@ -0,0 +1,17 @@
+from nose.tools import istest, eq_, ok_
+
+from relocator import Relocator
+from test_mapping import CODE, Files, load
+
+
+@istest
+def relocation_table():
+    relocations = [(offset, offset >> 4) for offset in range(0, 0x3000, 3)]
+    with Files(relocations) as files:
+        for mapped in (False, True):
+            loader, program = load(files, mapped)
+            relocator = Relocator(loader)
+            text = str(relocator)
+            eq_(list(zip(relocator.reloc_offsets, relocator.reloc_segments)), relocations)
+            ok_(text.endswith('Reloc %u\noffset: 2ffd\nsegment: 02ff\n' % len(relocations)))
+            eq_(bytes(program.program[:6]), CODE[:6])
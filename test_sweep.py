@@ -0,0 +1,34 @@
+from nose.tools import istest, eq_
+
+from address import Address
+from length_decoder import instruction_length
+from listing import format_instruction
+from sweep import LinearSweep, length_table
+
+
+@istest
+def length_table_matches_decoder():
+    program = bytearray(range(256)) * 4 + bytes(8)
+    lengths = length_table(program)
+    for offset in range(len(program) - 8):
+        eq_(lengths[offset], instruction_length(program, offset))
+
+
+@istest
+def length_table_matches_every_modrm():
+    for prefix in (b'', b'\x26', b'\xf3\x2e'):
+        for tail in (bytes(6), b'\xff' * 6):
+            program = b''.join(prefix + bytes((code, modrm)) + tail for code in range(256) for modrm in range(256))
+            size = len(prefix) + 8
+            lengths = length_table(program)
+            for offset in range(0, len(program), size):
+                eq_(lengths[offset], instruction_length(program, offset), program[offset:offset + size].hex())
+
+
+@istest
+def sweep_past_returns():
+    program = bytearray(b'\x90\x90\xb8\x12\x00\xc3\x8b\x5d\x08\xcb\x0f\x90')
+    sweep = LinearSweep(program, [Address(0, 2)])
+    eq_(list(sweep.boundaries()), [2, 5, 6, 9])
+    eq_([format_instruction(instruction) for instruction in sweep],
+        ['0000:0002 mov ax, 12h', '0000:0005 ret', '0000:0006 mov bx, [di+8]', '0000:0009 ret'])